@@ -1,3 +1,96 @@
-from django.contrib import admin
+import csv
+import io
 
-# Register your models here.
+from django.contrib import admin, messages
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.http import HttpResponse
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
+
+from jobs.models import Job
+from student_mgmt.pagination import EstimatedCountPaginator
+from .forms import RosterUploadForm
+from .models import User
+from .provisioning import activation_link, read_roster
+
+
+@admin.register(User)
+class UserAdmin(BaseUserAdmin):
+    """Django's UserAdmin plus our custom fields, tuned for large tables"""
+    fieldsets = BaseUserAdmin.fieldsets + (
+        ('Student information', {
+            'fields': ('role', 'roll_number', 'department', 'year_of_admission',
+                       'date_of_birth', 'profile_pic'),
+        }),
+    )
+    add_fieldsets = BaseUserAdmin.add_fieldsets + (
+        ('Student information', {'fields': ('role', 'roll_number')}),
+    )
+
+    list_display = ['username', 'email', 'role', 'roll_number', 'student_id', 'is_active', 'is_staff']
+    list_select_related = ['student_profile']
+    list_filter = ['role', 'is_staff', 'is_active']
+
+    # Prefix lookups on unique columns use their varchar_pattern_ops indexes
+    search_fields = ['username__startswith', 'roll_number__startswith']
+    search_help_text = 'Starts with: username or roll number (case-sensitive)'
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ['download_activation_links']
+
+    @admin.display(description='Student ID', ordering='student_profile__student_id')
+    def student_id(self, obj):
+        profile = getattr(obj, 'student_profile', None)
+        return profile.student_id if profile else '-'
+
+    def get_urls(self):
+        return [
+            path('provision-cohort/', self.admin_site.admin_view(self.provision_cohort_view),
+                 name='accounts_user_provision_cohort'),
+        ] + super().get_urls()
+
+    def provision_cohort_view(self, request):
+        """Upload a roster and provision it in the background job queue"""
+        if not self.has_add_permission(request):
+            return redirect('admin:accounts_user_changelist')
+        form = RosterUploadForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            try:
+                rows = read_roster(io.TextIOWrapper(form.cleaned_data['roster'], encoding='utf-8'))
+            except (ValueError, UnicodeDecodeError) as e:
+                form.add_error('roster', str(e))
+            else:
+                # Activation mode only: never store plain-text passwords in a job payload
+                rows = [{k: v for k, v in row.items() if k != 'password'} for row in rows]
+                job = Job.objects.enqueue('accounts.provision_cohort', {'rows': rows},
+                                          created_by=request.user)
+                self.message_user(request, f'Provisioning {len(rows)} student(s) in job #{job.pk}. '
+                                           'Use "Download activation links" once it finishes.')
+                return redirect('admin:jobs_job_change', job.pk)
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Provision cohort',
+            'form': form,
+            'opts': self.model._meta,
+        }
+        return TemplateResponse(request, 'admin/accounts/user/provision_cohort.html', context)
+
+    @admin.action(permissions=['change'], description='Download activation links for selected students')
+    def download_activation_links(self, request, queryset):
+        # Students with an unusable password, not yet activated. Never staff
+        # accounts, which may have unusable passwords for other reasons.
+        pending = queryset.filter(role='student', password__startswith='!')
+        if not pending.exists():
+            self.message_user(request, 'None of the selected students are awaiting activation.',
+                              messages.WARNING)
+            return None
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="activation_links.csv"'
+        writer = csv.writer(response)
+        writer.writerow(['username', 'email', 'activation_url'])
+        for user in pending.iterator():
+            writer.writerow([user.username, user.email,
+                             request.build_absolute_uri(activation_link(user))])
+        return response
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        from .models import User
+        from .sessions import invalidate_cached_user
+
+        # Keep CachedUserBackend from serving a stale request.user
+        post_save.connect(invalidate_cached_user, sender=User,
+                          dispatch_uid='accounts.user_cache_saved')
+        post_delete.connect(invalidate_cached_user, sender=User,
+                            dispatch_uid='accounts.user_cache_deleted')
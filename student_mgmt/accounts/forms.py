@@ -2,12 +2,16 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from .models import User
+from student_mgmt.uniqueness import UniqueFieldsMixin
 
-class StudentRegistrationForm(UserCreationForm):
+class StudentRegistrationForm(UniqueFieldsMixin, UserCreationForm):
     """
     Form for student registration
     Extends Django's UserCreationForm which handles password validation
+    Username (case-insensitively) and roll number are checked in one query
     """
+    unique_lookups = {'username': 'iexact'}
+
     email = forms.EmailField(required=True, widget=forms.EmailInput(attrs={'class': 'form-control'}))
     roll_number = forms.CharField(max_length=20, widget=forms.TextInput(attrs={'class': 'form-control'}))
     department = forms.CharField(max_length=100, widget=forms.TextInput(attrs={'class': 'form-control'}))
@@ -28,6 +32,10 @@ class StudentRegistrationForm(UserCreationForm):
         self.fields['password1'].widget.attrs['class'] = 'form-control'
         self.fields['password2'].widget.attrs['class'] = 'form-control'
     
+    def clean_username(self):
+        # UserCreationForm queries for case variants here; validate_unique covers it
+        return self.cleaned_data.get('username')
+    
     def save(self, commit=True):
         user = super().save(commit=False)
         user.role = 'student'  # Automatically set role to student
@@ -38,4 +46,9 @@ class StudentRegistrationForm(UserCreationForm):
 class LoginForm(forms.Form):
     """Simple login form"""
     username = forms.CharField(widget=forms.TextInput(attrs={'class': 'form-control'}))
-    password = forms.CharField(widget=forms.PasswordInput(attrs={'class': 'form-control'}))
\ No newline at end of file
+    password = forms.CharField(widget=forms.PasswordInput(attrs={'class': 'form-control'}))
+
+class RosterUploadForm(forms.Form):
+    """Admin upload of a cohort roster CSV"""
+    roster = forms.FileField(help_text='CSV with student_id, email, first_name, last_name, '
+                                       'department, year_of_admission, date_of_birth columns')
@@ -0,0 +1,17 @@
+# accounts/hashing.py
+"""
+Password hashing in pool processes for cohort provisioning
+
+Children are spawned and unpickle references to these functions before
+Django is configured, so nothing here imports models at module level.
+"""
+
+
+def init_hasher_process():
+    import django
+    django.setup()
+
+
+def hash_passwords(passwords):
+    from django.contrib.auth.hashers import make_password
+    return [make_password(password) for password in passwords]
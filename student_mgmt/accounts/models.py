@@ -12,7 +12,7 @@ class User(AbstractUser):
     ]
     
     # Add custom fields
-    role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='student')
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='student', db_index=True)
     roll_number = models.CharField(max_length=20, unique=True, null=True, blank=True)
     department = models.CharField(max_length=100, null=True, blank=True)
     year_of_admission = models.IntegerField(null=True, blank=True)
@@ -0,0 +1,71 @@
+# accounts/sessions.py
+"""
+Cached sessions and cached request.user loading
+
+SessionStore is Django's cached_db store (reads from the cache, writes go
+through to django_session as well) with the database alias in its cache
+keys. Tenants share one cache and, with URL-prefix tenants, one session
+cookie, so a session may only resolve against the database it was created
+in. Enabled with SESSION_ENGINE = 'accounts.sessions'.
+
+CachedUserBackend is ModelBackend with get_user() served from the cache,
+which removes the accounts_user query AuthenticationMiddleware makes on
+every request. Entries are dropped whenever a User is saved or deleted
+(see AccountsConfig.ready); USER_CACHE_TIMEOUT bounds how long changes
+made with QuerySet.update(), or in another process when the cache is
+process-local, can go unnoticed.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.sessions.backends.cached_db import KEY_PREFIX, SessionStore as CachedDBStore
+from django.core.cache import caches
+from django.db import router
+
+
+class SessionStore(CachedDBStore):
+    @property
+    def cache_key_prefix(self):
+        return f'{KEY_PREFIX}:{router.db_for_write(self.model)}:'
+
+
+def _user_cache():
+    return caches[getattr(settings, 'USER_CACHE_ALIAS', 'default')]
+
+
+def _user_cache_timeout():
+    return getattr(settings, 'USER_CACHE_TIMEOUT', 60)
+
+
+def user_cache_key(user_id, using):
+    return f'auth-user:{using}:{user_id}'
+
+
+def forget_cached_user(user_id, using):
+    """Drop a cached user after changing it without User.save()"""
+    _user_cache().delete(user_cache_key(user_id, using))
+
+
+def invalidate_cached_user(sender, instance, using, **kwargs):
+    """post_save/post_delete handler for the user model"""
+    forget_cached_user(instance.pk, using)
+
+
+class CachedUserBackend(ModelBackend):
+    def get_user(self, user_id):
+        key = user_cache_key(user_id, router.db_for_read(get_user_model()))
+        user = _user_cache().get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                _user_cache().set(key, user, _user_cache_timeout())
+        return user
+
+    async def aget_user(self, user_id):
+        key = user_cache_key(user_id, router.db_for_read(get_user_model()))
+        user = await _user_cache().aget(key)
+        if user is None:
+            user = await super().aget_user(user_id)
+            if user is not None:
+                await _user_cache().aset(key, user, _user_cache_timeout())
+        return user
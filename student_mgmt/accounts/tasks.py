@@ -0,0 +1,18 @@
+# accounts/tasks.py
+from jobs.registry import task
+from .provisioning import provision_cohort
+
+
+@task('accounts.provision_cohort')
+def provision_cohort_task(job, rows):
+    """
+    Activation-mode provisioning queued from the admin
+    Plain-text passwords are never put in a job payload; use the
+    provision_cohort command for the --passwords mode.
+    """
+    summary, users = provision_cohort(
+        rows,
+        progress=lambda done, total: job.set_progress(
+            100 * done // total, f'{done} of {total} accounts created'),
+    )
+    return summary
@@ -1,3 +1,129 @@
+from django.contrib.auth.models import Permission
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from student_mgmt.uniqueness import KeyPrefilter, find_taken, validate_batch
+from .forms import StudentRegistrationForm
+from .models import User
+from .provisioning import activation_link, provision_cohort
+
+
+class ActivationLinksActionTests(TestCase):
+    def setUp(self):
+        self.student = User.objects.create_user('student1', role='student')  # Unusable password
+        self.admin_account = User.objects.create_user('ops', role='admin')
+        self.staff = User.objects.create_user('staff', password='x', role='admin', is_staff=True)
+        self.client.force_login(self.staff)
+
+    def run_action(self, *users):
+        return self.client.post(reverse('admin:accounts_user_changelist'), {
+            'action': 'download_activation_links',
+            '_selected_action': [user.pk for user in users],
+        })
+
+    def grant(self, *codenames):
+        self.staff.user_permissions.add(*Permission.objects.filter(codename__in=codenames))
+
+    def test_view_permission_is_not_enough(self):
+        self.grant('view_user')
+        response = self.run_action(self.student)
+        self.assertNotEqual(response.get('Content-Type'), 'text/csv')
+
+    def test_only_students_get_links(self):
+        self.grant('view_user', 'change_user')
+        response = self.run_action(self.student, self.admin_account)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        body = response.content.decode()
+        self.assertIn('student1', body)
+        self.assertNotIn('ops', body)
+
+    def test_activation_link_rejects_non_students(self):
+        response = self.client.get(activation_link(self.admin_account))
+        self.assertRedirects(response, reverse('login'), fetch_redirect_response=False)
+        response = self.client.get(activation_link(self.student))
+        self.assertEqual(response.status_code, 200)
+
+    def test_activation_sets_password_and_logs_in(self):
+        self.client.logout()
+        response = self.client.post(activation_link(self.student), {
+            'new_password1': 'a-Long-first-passw0rd', 'new_password2': 'a-Long-first-passw0rd',
+        })
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+        self.student.refresh_from_db()
+        self.assertTrue(self.student.check_password('a-Long-first-passw0rd'))
+        self.assertEqual(int(self.client.session['_auth_user_id']), self.student.pk)
+        # The token dies with the password change
+        response = self.client.get(activation_link(self.student))
+        self.assertRedirects(response, reverse('login'), fetch_redirect_response=False)
+
+
+class SessionBackendTests(TestCase):
+    def test_sessions_from_model_backend_stay_logged_in(self):
+        user = User.objects.create_user('old-session', password='x')
+        self.client.force_login(user, backend='django.contrib.auth.backends.ModelBackend')
+        response = self.client.get(reverse('profile'))
+        self.assertEqual(response.wsgi_request.user, user)
+
+
+class UniquenessTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user('alice', password='x', roll_number='R1')
+
+    def registration(self, **data):
+        return StudentRegistrationForm({
+            'username': 'newcomer', 'email': 'new@example.com', 'roll_number': 'R2',
+            'password1': 'a-Long-first-passw0rd', 'password2': 'a-Long-first-passw0rd',
+            'department': 'CS', 'year_of_admission': 2024, 'date_of_birth': '2005-01-01', **data,
+        })
+
+    def test_find_taken(self):
+        values = {'username': 'ALICE', 'roll_number': 'R1'}
+        self.assertEqual(find_taken(User, values, lookups={'username': 'iexact'}), values)
+        self.assertEqual(find_taken(User, values), {'roll_number': 'R1'})
+        excluded = find_taken(User, values, exclude_pk=self.alice.pk, lookups={'username': 'iexact'})
+        self.assertEqual(excluded, {})
+        self.assertEqual(find_taken(User, {'username': 'bob', 'roll_number': ''}), {})
+
+    def test_registration_rejects_case_variants_in_one_query(self):
+        self.assertTrue(self.registration().is_valid())
+        form = self.registration(username='Alice', roll_number='R1')
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+        self.assertEqual(set(form.errors), {'username', 'roll_number'})
+
+    def test_validate_batch(self):
+        rows = [{'username': 'ALICE'}, {'username': 'bob'}, {'username': 'Bob'}, {'username': ''}]
+        self.assertEqual(validate_batch(User, rows, ['username'], lookups={'username': 'iexact'}), {
+            0: {'username': "username 'ALICE' already exists"},
+            2: {'username': "Duplicate username 'Bob' in batch"},
+        })
+        self.assertEqual(validate_batch(User, rows, ['username']), {})
+
+    def test_prefilter_hits_and_misses(self):
+        prefilter = KeyPrefilter(User, ['username', 'roll_number'], lookups={'username': 'iexact'})
+        self.assertTrue(prefilter.might_exist('username', 'Alice'))
+        self.assertTrue(prefilter.might_exist('roll_number', 'R1'))
+        self.assertFalse(prefilter.might_exist('roll_number', 'r1'))
+        self.assertFalse(prefilter.might_exist('username', 'carol'))
+
+        rows = [{'username': 'carol', 'roll_number': 'R9'}]
+        with self.assertNumQueries(0):  # Certain misses never reach the database
+            self.assertEqual(validate_batch(User, rows, ['username', 'roll_number'], prefilter=prefilter,
+                                            lookups={'username': 'iexact'}), {})
+        rows.append({'username': 'ALICE', 'roll_number': 'R8'})
+        errors = validate_batch(User, rows, ['username', 'roll_number'], prefilter=prefilter,
+                                lookups={'username': 'iexact'})
+        self.assertEqual(errors, {1: {'username': "username 'ALICE' already exists"}})
+
+    def test_provisioning_treats_usernames_case_insensitively(self):
+        row = {'email': 'x@example.com', 'first_name': 'A', 'last_name': 'B', 'department': 'CS',
+               'year_of_admission': '2024', 'date_of_birth': '2005-01-01'}
+        for prefilter in (False, True):
+            summary, users = provision_cohort([
+                {**row, 'student_id': 'S1', 'username': 'Alice'},
+                {**row, 'student_id': 'S2', 'username': 'bob', 'email': 'bob@example.com'},
+                {**row, 'student_id': 'S3', 'username': 'BOB', 'email': 'bob2@example.com'},
+            ], prefilter=prefilter)
+            self.assertEqual([line for line, message in summary['errors']], [1, 3])
+            User.objects.filter(username='bob').delete()
+        self.assertFalse(User.objects.filter(username='Alice').exists())
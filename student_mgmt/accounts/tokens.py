@@ -0,0 +1,14 @@
+# accounts/tokens.py
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+
+
+class AccountActivationTokenGenerator(PasswordResetTokenGenerator):
+    """
+    One-time tokens for provisioned accounts that have no password yet
+    The token hashes the user's password field, so it stops working as soon
+    as the student sets a password. Lifetime is PASSWORD_RESET_TIMEOUT.
+    """
+    key_salt = 'accounts.tokens.AccountActivationTokenGenerator'
+
+
+activation_token_generator = AccountActivationTokenGenerator()
@@ -6,9 +6,12 @@ urlpatterns = [
     path('', views.home_view, name='home'),
     path('register/', views.register_view, name='register'),
     path('login/', views.login_view, name='login'),
+    path('activate/<uidb64>/<token>/', views.activate_account_view, name='activate_account'),
     path('logout/', views.logout_view, name='logout'),
     path('profile/', views.profile_view, name='profile'),
     path('dashboard/', views.dashboard_view, name='dashboard'),
     path('dashboard/admin/', views.admin_dashboard_view, name='admin_dashboard'),
+    path('dashboard/admin/events/', views.admin_dashboard_events_view, name='admin_dashboard_events'),
+    path('dashboard/campuses/', views.campus_overview_view, name='campus_overview'),
     path('dashboard/student/', views.student_dashboard_view, name='student_dashboard'),
 ]
\ No newline at end of file
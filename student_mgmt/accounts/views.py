@@ -1,10 +1,21 @@
 # accounts/views.py
+import asyncio
+
 from django.shortcuts import render, redirect
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.contrib.auth.forms import SetPasswordForm
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode
 from .forms import StudentRegistrationForm, LoginForm
 from .models import User
+from .tokens import activation_token_generator
+from student_mgmt.counts import count_rows
+from tenancy.aggregates import fan_out
+from tenancy.tenants import get_current_tenant
 
 def home_view(request):
     """Home page view"""
@@ -55,6 +66,37 @@ def login_view(request):
     
     return render(request, 'accounts/login.html', {'form': form})
 
+def activate_account_view(request, uidb64, token):
+    """
+    One-time link for provisioned students to choose their first password
+    The token is invalidated by the password change itself.
+    """
+    try:
+        user = User.objects.get(pk=force_str(urlsafe_base64_decode(uidb64)))
+    except (TypeError, ValueError, OverflowError, User.DoesNotExist):
+        user = None
+
+    # Only provisioned students that have never set a password
+    if (user is None or not user.is_student() or user.has_usable_password()
+            or not activation_token_generator.check_token(user, token)):
+        messages.error(request, 'This activation link is invalid or has already been used.')
+        return redirect('login')
+
+    if request.method == 'POST':
+        form = SetPasswordForm(user, request.POST)
+        if form.is_valid():
+            form.save()
+            # Not from authenticate(), so the backend must be named
+            login(request, user, backend='accounts.sessions.CachedUserBackend')
+            messages.success(request, f'Welcome, {user.username}! Your account is ready.')
+            return redirect('dashboard')
+    else:
+        form = SetPasswordForm(user)
+    for field in form.fields.values():
+        field.widget.attrs['class'] = 'form-control'
+
+    return render(request, 'accounts/activate.html', {'form': form, 'activating_user': user})
+
 def logout_view(request):
     """Handle user logout - destroys session"""
     logout(request)
@@ -84,7 +126,7 @@ def admin_dashboard_view(request):
         return redirect('student_dashboard')
     
     # Get statistics for dashboard
-    total_students = User.objects.filter(role='student').count()
+    total_students = count_rows(User.objects.filter(role='student'))
     context = {
         'total_students': total_students,
     }
@@ -100,17 +142,18 @@ def student_dashboard_view(request):
 @login_required
 def admin_dashboard_view(request):
     """Enhanced Admin dashboard with statistics"""
-    from students.models import Student
+    from students.models import ArchivedStudent, Student
     
     if not request.user.is_admin():
         messages.error(request, 'Access denied. Admin only.')
         return redirect('student_dashboard')
     
-    # Get statistics for dashboard
-    total_students = Student.objects.count()
-    active_students = Student.objects.filter(status='active').count()
-    inactive_students = Student.objects.filter(status='inactive').count()
-    graduated_students = Student.objects.filter(status='graduated').count()
+    # Get statistics for dashboard (estimated/capped counts, cached briefly)
+    total_students = count_rows(Student.objects.all())
+    active_students = count_rows(Student.objects.filter(status='active'))
+    inactive_students = count_rows(Student.objects.filter(status='inactive'))
+    graduated_students = count_rows(Student.objects.filter(status='graduated'))
+    archived_students = count_rows(ArchivedStudent.objects.all())
     
     # Recent students (last 5 added)
     recent_students = Student.objects.order_by('-created_at')[:5]
@@ -126,11 +169,88 @@ def admin_dashboard_view(request):
         'active_students': active_students,
         'inactive_students': inactive_students,
         'graduated_students': graduated_students,
+        'archived_students': archived_students,
         'recent_students': recent_students,
         'department_stats': department_stats,
+        'status_cards': [
+            ('Active', active_students, 'active', 'success'),
+            ('Inactive', inactive_students, 'inactive', 'secondary'),
+            ('Graduated', graduated_students, 'graduated', 'info'),
+            ('Archived', archived_students, 'archived', 'dark'),
+        ],
     }
     return render(request, 'accounts/admin_dashboard.html', context)
 
+@login_required
+async def admin_dashboard_events_view(request):
+    """
+    Server-sent events for the admin dashboard - admin only
+    Pushes status/department count deltas and new students as they happen
+    (see students/live.py). Needs an ASGI server: under WSGI a stream that
+    never ends would hold a worker, so 204 tells the browser not to retry.
+    """
+    from students.live import publisher
+
+    user = await request.auser()
+    if not user.is_admin():
+        return HttpResponse(status=403)
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+
+    # The tenant context ends with the middleware, before streaming starts
+    tenant = get_current_tenant()
+
+    async def event_stream():
+        subscriber = publisher.subscribe(tenant)
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber.queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'  # Also how we notice a closed connection
+        finally:
+            publisher.unsubscribe(subscriber)
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Don't let nginx buffer the stream
+    return response
+
+@login_required
+def campus_overview_view(request):
+    """Admin only - student totals for every campus, queried in parallel"""
+    from students.models import Student
+    from django.db.models import Count
+
+    if not request.user.is_admin():
+        messages.error(request, 'Access denied. Admin only.')
+        return redirect('student_dashboard')
+
+    def campus_stats():
+        by_status = dict(
+            Student.objects.order_by().values_list('status').annotate(count=Count('pk'))
+        )
+        return {'total': sum(by_status.values()), 'by_status': by_status}
+
+    campuses = fan_out(campus_stats)
+
+    # One row per campus: name, total, then a count per status column
+    statuses = [value for value, label in Student.STATUS_CHOICES]
+    rows = [
+        (name, stats['total'], [stats['by_status'].get(status, 0) for status in statuses])
+        for name, stats in sorted(campuses.items())
+    ]
+    totals = [sum(row[2][i] for row in rows) for i in range(len(statuses))]
+
+    context = {
+        'rows': rows,
+        'grand_total': sum(row[1] for row in rows),
+        'totals': totals,
+        'status_choices': Student.STATUS_CHOICES,
+    }
+    return render(request, 'accounts/campus_overview.html', context)
+
 @login_required
 def student_dashboard_view(request):
     """Enhanced Student dashboard"""
@@ -0,0 +1,33 @@
+from django.contrib import admin
+from django.utils import timezone
+from django.utils.html import format_html
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'name', 'status', 'progress_bar', 'progress_message',
+                    'attempts', 'run_after', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name']
+    list_select_related = ['created_by']
+    raw_id_fields = ['created_by']
+    readonly_fields = ['attempts', 'progress', 'progress_message', 'result', 'last_error',
+                       'locked_by', 'locked_at', 'created_at', 'updated_at', 'finished_at']
+    actions = ['retry_jobs']
+
+    @admin.display(description='Progress', ordering='progress')
+    def progress_bar(self, obj):
+        return format_html(
+            '<progress value="{}" max="100" title="{}%"></progress> {}%',
+            obj.progress, obj.progress, obj.progress,
+        )
+
+    @admin.action(description='Retry selected failed jobs now')
+    def retry_jobs(self, request, queryset):
+        count = queryset.filter(status='failed').update(
+            status='queued', attempts=0, run_after=timezone.now(),
+            locked_by='', locked_at=None, finished_at=None,
+        )
+        self.message_user(request, f'{count} job(s) queued for retry.')
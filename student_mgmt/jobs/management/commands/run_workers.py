@@ -0,0 +1,142 @@
+# jobs/management/commands/run_workers.py
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.pool import init_pool_process, run_job
+from jobs.worker import claim_jobs, release_job, requeue_stale
+from tenancy.tenants import use_tenant
+
+
+class Command(BaseCommand):
+    help = 'Run background jobs from the database queue using a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count() or 1,
+            help='Number of pool processes (default: CPU count)',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='Seconds to wait between queue polls when idle',
+        )
+        parser.add_argument(
+            '--stale-after', type=int, default=600,
+            help='Requeue running jobs whose worker has not checked in for this many seconds',
+        )
+        parser.add_argument(
+            '--tenant',
+            help='Campus whose job queue to run (default: the default database)',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit once the queue has no due jobs instead of polling forever',
+        )
+
+    def handle(self, *args, **options):
+        with use_tenant(options['tenant']):
+            self.run(**options)
+
+    def run(self, **options):
+        processes = max(1, options['processes'])
+        poll_interval = options['poll_interval']
+        stale_after = options['stale_after']
+        worker_id = self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+
+        self.reclaim_stale(stale_after)
+        # Also reclaim periodically: other dispatchers may die while we run
+        next_reclaim = time.monotonic() + stale_after / 2
+
+        self.tenant = options['tenant']
+        self.pool_broken = False
+        pool = self.make_pool(processes)
+        self.stdout.write(f'Worker {worker_id} started with {processes} process(es)')
+
+        running = {}  # future -> job id
+        try:
+            while not self.stopping:
+                if self.pool_broken:
+                    pool.shutdown(wait=False)
+                    time.sleep(poll_interval)
+                    pool = self.make_pool(processes)
+                    self.pool_broken = False
+
+                if time.monotonic() >= next_reclaim:
+                    self.reclaim_stale(stale_after)
+                    next_reclaim = time.monotonic() + stale_after / 2
+
+                for job_id in claim_jobs(worker_id, processes - len(running)):
+                    running[pool.submit(run_job, job_id)] = job_id
+
+                if not running:
+                    if options['once']:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.report(running.pop(future), future)
+
+                # Heartbeat so other dispatchers don't treat long jobs as stale
+                Job.objects.filter(id__in=running.values(), locked_by=worker_id).update(locked_at=timezone.now())
+        finally:
+            # Let in-flight jobs finish; unstarted ones are still 'running'
+            # in the DB and will be requeued as stale if we are killed.
+            for future in list(running):
+                wait([future])
+                self.report(running.pop(future), future)
+            pool.shutdown()
+
+    def make_pool(self, processes):
+        # Spawned children never share the parent's DB sockets
+        connections.close_all()
+        return ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_pool_process,
+            initargs=(self.tenant,),
+        )
+
+    def reclaim_stale(self, stale_after):
+        released = requeue_stale(stale_after)
+        if released:
+            self.stdout.write(self.style.WARNING(f'Reclaimed {released} stale job(s)'))
+
+    def request_stop(self, signum, frame):
+        self.stdout.write('Shutting down after in-flight jobs finish...')
+        self.stopping = True
+
+    def report(self, job_id, future):
+        try:
+            ok = future.result()
+        except BrokenProcessPool:
+            # The pool process died (e.g. OOM kill). A job that keeps killing
+            # its worker still runs out of attempts like any failing job.
+            job = Job.objects.only('pk', 'attempts', 'max_attempts').get(pk=job_id)
+            job.locked_by = self.worker_id  # Leave it alone if someone else reclaimed it
+            release_job(job, 'Worker process died while running this job')
+            job.refresh_from_db(fields=['status'])
+            self.stderr.write(f'Job #{job_id} lost its worker process; {job.status}')
+            self.pool_broken = True
+            return
+        except Exception as e:
+            self.stderr.write(f'Job #{job_id} could not be run: {e}')
+            return
+        if ok:
+            self.stdout.write(self.style.SUCCESS(f'Job #{job_id} succeeded'))
+        else:
+            self.stdout.write(self.style.ERROR(f'Job #{job_id} raised an error'))
@@ -0,0 +1,83 @@
+# jobs/models.py
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+
+
+class JobManager(models.Manager):
+    def enqueue(self, name, payload=None, run_after=None, max_attempts=None, created_by=None):
+        """Queue a registered task to be picked up by `manage.py run_workers`"""
+        from .registry import get_task
+        get_task(name)  # Fail at enqueue time, not in the worker, for unknown names
+        return self.create(
+            name=name,
+            payload=payload or {},
+            run_after=run_after or timezone.now(),
+            max_attempts=max_attempts or getattr(settings, 'JOBS_DEFAULT_MAX_ATTEMPTS', 3),
+            created_by=created_by,
+        )
+
+
+class Job(models.Model):
+    """
+    A unit of background work stored in the database
+    Workers claim queued rows, run the registered task and record the outcome
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100, help_text="Registered task name")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+
+    # Retry bookkeeping
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    # Progress reported by the running task
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Percent complete")
+    progress_message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True, blank=True)
+
+    # Which worker holds the job, for stale-lock recovery
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    objects = JobManager()
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # The claim query: WHERE status = 'queued' AND run_after <= now ORDER BY run_after
+            models.Index(fields=['status', 'run_after'], name='jobs_claim_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.get_status_display()})"
+
+    def set_progress(self, progress, message=''):
+        """Record progress from inside a task without touching other columns"""
+        self.progress = max(0, min(int(progress), 100))
+        self.progress_message = message[:255]
+        Job.objects.filter(pk=self.pk).update(
+            progress=self.progress,
+            progress_message=self.progress_message,
+            updated_at=timezone.now(),
+        )
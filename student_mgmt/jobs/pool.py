@@ -0,0 +1,26 @@
+# jobs/pool.py
+"""
+Entry points for run_workers pool processes
+
+Children are spawned, so they unpickle references to these functions before
+Django is configured. Keep model imports inside the functions.
+"""
+import signal
+
+
+def init_pool_process(tenant=None):
+    """Pool initializer: set up Django (and the campus, if any) in the fresh process"""
+    import django
+    from django.db import connections
+    # Ctrl-C is handled by the dispatcher, which lets running jobs finish
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    django.setup()
+    connections.close_all()
+    if tenant:
+        from tenancy.tenants import activate_tenant
+        activate_tenant(tenant)
+
+
+def run_job(job_id):
+    from .worker import execute_job
+    return execute_job(job_id)
@@ -0,0 +1,41 @@
+# jobs/registry.py
+"""
+Task registry for background jobs
+
+Apps declare tasks in their own tasks.py (autodiscovered by JobsConfig):
+
+    from jobs.registry import task
+
+    @task('students.bulk_update')
+    def bulk_update(job, student_ids, changes):
+        ...
+        job.set_progress(50, 'Halfway there')
+        return {'updated': n}
+
+The task receives the Job instance followed by the payload as keyword
+arguments. The return value must be JSON-serializable and is stored in
+Job.result.
+"""
+
+_registry = {}
+
+
+def task(name):
+    """Decorator registering a function under `name`"""
+    def decorator(func):
+        if name in _registry and _registry[name] is not func:
+            raise ValueError(f'Task {name!r} is already registered')
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def get_task(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f'No task registered as {name!r}')
+
+
+def registered_tasks():
+    return sorted(_registry)
@@ -0,0 +1,68 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from io import StringIO
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .management.commands.run_workers import Command
+from .models import Job
+from .registry import task
+from .worker import execute_job, requeue_stale
+
+
+@task('tests.reclaimed_while_running')
+def reclaimed_while_running(job):
+    # As if requeue_stale took the job back and another worker claimed it
+    Job.objects.filter(pk=job.pk).update(locked_by='host:2')
+    return {'ok': True}
+
+
+class LostJobTests(TestCase):
+    def running_job(self, attempts, locked_minutes_ago=0):
+        return Job.objects.create(
+            name='tests.noop', status='running', attempts=attempts, max_attempts=3,
+            locked_by='host:1', locked_at=timezone.now() - timedelta(minutes=locked_minutes_ago),
+        )
+
+    def lose_worker(self, job):
+        future = Future()
+        future.set_exception(BrokenProcessPool())
+        command = Command(stdout=StringIO(), stderr=StringIO())
+        command.worker_id = 'host:1'
+        command.report(job.pk, future)
+        job.refresh_from_db()
+        return job
+
+    def test_lost_worker_requeues_with_backoff(self):
+        job = self.lose_worker(self.running_job(attempts=1))
+        self.assertEqual((job.status, job.attempts, job.locked_by), ('queued', 1, ''))
+        self.assertGreater(job.run_after, timezone.now())
+
+    def test_lost_worker_fails_after_max_attempts(self):
+        job = self.lose_worker(self.running_job(attempts=3))
+        self.assertEqual(job.status, 'failed')
+        self.assertIsNotNone(job.finished_at)
+
+    def test_requeue_stale_applies_attempt_limit(self):
+        retry = self.running_job(attempts=1, locked_minutes_ago=30)
+        exhausted = self.running_job(attempts=3, locked_minutes_ago=30)
+        fresh = self.running_job(attempts=1)
+        self.assertEqual(requeue_stale(stale_after=600), 2)
+        statuses = dict(Job.objects.values_list('pk', 'status'))
+        self.assertEqual(
+            [statuses[retry.pk], statuses[exhausted.pk], statuses[fresh.pk]],
+            ['queued', 'failed', 'running'],
+        )
+
+    def test_reclaimed_job_is_left_to_its_new_worker(self):
+        job = self.running_job(attempts=0)
+        Job.objects.filter(pk=job.pk).update(locked_by='host:2')
+        self.assertEqual(self.lose_worker(job).status, 'running')
+
+        job = self.running_job(attempts=0)
+        Job.objects.filter(pk=job.pk).update(name='tests.reclaimed_while_running')
+        self.assertTrue(execute_job(job.pk))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), ('running', 'host:2'))
@@ -0,0 +1,112 @@
+# jobs/worker.py
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_task
+
+
+def claim_jobs(worker_id, limit):
+    """
+    Atomically move up to `limit` due jobs from queued to running
+
+    PostgreSQL (and other backends with SKIP LOCKED) lock candidate rows with
+    SELECT ... FOR UPDATE SKIP LOCKED, so concurrent dispatchers never wait on
+    or double-claim each other's rows. SQLite has no row locks; there each
+    candidate is claimed with a conditional UPDATE and only rows whose status
+    was still 'queued' are kept.
+    """
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    due = Job.objects.filter(status='queued', run_after__lte=now).order_by('run_after', 'id')
+    claim = {'status': 'running', 'locked_by': worker_id, 'locked_at': now, 'updated_at': now}
+
+    db = router.db_for_write(Job)
+    if connections[db].features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=db):
+            ids = list(due.select_for_update(skip_locked=True).values_list('id', flat=True)[:limit])
+            Job.objects.filter(id__in=ids).update(**claim)
+    else:
+        ids = []
+        for job_id in due.values_list('id', flat=True)[:limit]:
+            if Job.objects.filter(id=job_id, status='queued').update(**claim):
+                ids.append(job_id)
+    return ids
+
+
+def requeue_stale(stale_after):
+    """
+    Return jobs held by a worker that died mid-run to the queue, with the
+    same attempt limit and backoff as a failing task. Returns the count.
+    """
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    stale = Job.objects.filter(status='running', locked_at__lt=cutoff).only(
+        'pk', 'attempts', 'max_attempts', 'locked_by')
+    released = 0
+    for job in stale:
+        released += release_job(job, 'Worker stopped responding; job was reclaimed')
+    return released
+
+
+def release_job(job, error):
+    """
+    Take a running job back after a failed or lost attempt
+    It is queued again after retry_delay() until max_attempts is used up,
+    then marked failed. Returns 1 if `job.locked_by` still held the job,
+    else 0 (it finished or was reclaimed by another worker meanwhile).
+    """
+    now = timezone.now()
+    running = Job.objects.filter(pk=job.pk, status='running', locked_by=job.locked_by)
+    if job.attempts < job.max_attempts:
+        return running.update(
+            status='queued',
+            run_after=now + timedelta(seconds=retry_delay(max(job.attempts, 1))),
+            last_error=error,
+            locked_by='',
+            locked_at=None,
+            updated_at=now,
+        )
+    return running.update(status='failed', last_error=error, finished_at=now, updated_at=now)
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter: base * 2^(attempts-1), capped"""
+    base = getattr(settings, 'JOBS_RETRY_BACKOFF_SECONDS', 30)
+    cap = getattr(settings, 'JOBS_RETRY_BACKOFF_MAX_SECONDS', 3600)
+    delay = min(base * 2 ** (attempts - 1), cap)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def execute_job(job_id):
+    """
+    Run one claimed job to completion and record the outcome
+    Called inside a pool process; never raises for task errors.
+    """
+    job = Job.objects.get(pk=job_id)
+    job.attempts += 1
+    Job.objects.filter(pk=job.pk).update(attempts=job.attempts)
+
+    try:
+        func = get_task(job.name)
+        result = func(job, **job.payload)
+    except Exception:
+        release_job(job, traceback.format_exc())
+        return False
+
+    now = timezone.now()
+    # Unless the job was reclaimed as stale and claimed again meanwhile
+    Job.objects.filter(pk=job.pk, status='running', locked_by=job.locked_by).update(
+        status='succeeded',
+        result=result,
+        progress=100,
+        finished_at=now,
+        updated_at=now,
+    )
+    return True
+
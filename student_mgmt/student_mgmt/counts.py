@@ -0,0 +1,113 @@
+# student_mgmt/counts.py
+"""
+Count service for list headers, dashboards and paginators
+
+    count_rows(Student.objects.all())          # planner estimate on big tables
+    count_rows(Student.objects.filter(...))    # exact, capped, cached briefly
+
+Results are ints, so they work anywhere a count does, but render as
+"10,000+" when capped or "~1,234,567" when estimated.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+# Below this many rows an exact COUNT(*) is cheap and more useful than an estimate
+ESTIMATE_THRESHOLD = 10000
+
+
+class CountResult(int):
+    """An int that remembers whether it is exact, estimated or capped"""
+
+    def __new__(cls, value, estimated=False, capped=False):
+        obj = super().__new__(cls, value)
+        obj.estimated = estimated
+        obj.capped = capped
+        return obj
+
+    @property
+    def exact(self):
+        return not (self.estimated or self.capped)
+
+    def __str__(self):
+        if self.capped:
+            return f'{int(self):,}+'
+        if self.estimated:
+            return f'~{int(self):,}'
+        return f'{int(self):,}'
+
+    def __reduce__(self):
+        # Keep the flags when stored in the cache
+        return (CountResult, (int(self), self.estimated, self.capped))
+
+
+def is_unfiltered(queryset):
+    """True if counting `queryset` is the same as counting its whole table"""
+    query = queryset.query
+    return not (
+        query.where
+        or query.distinct
+        or query.is_sliced
+        or query.combinator
+        or query.group_by
+    )
+
+
+def estimated_row_count(queryset):
+    """
+    Planner estimate (pg_class.reltuples) for an unfiltered PostgreSQL queryset
+    Returns None when no usable estimate exists, so callers fall back to COUNT(*)
+    """
+    if not hasattr(queryset, 'query') or not is_unfiltered(queryset):
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [connection.ops.quote_name(queryset.model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 for tables that have never been analyzed
+    if row is None or row[0] < ESTIMATE_THRESHOLD:
+        return None
+    return row[0]
+
+
+def filter_signature(queryset):
+    """
+    Cache key for the rows a queryset matches
+    Ordering and select_related don't change the count, so they are stripped
+    before the SQL is hashed.
+    """
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    digest = hashlib.sha1(repr((queryset.db, sql, params)).encode()).hexdigest()
+    return f'count:{queryset.model._meta.label_lower}:{digest}'
+
+
+def count_rows(queryset, cap=None, timeout=None):
+    """
+    Count `queryset` without ever scanning more than `cap` + 1 rows
+
+    Unfiltered querysets on large PostgreSQL tables return the planner
+    estimate. Everything else is counted exactly up to `cap` and cached for
+    `timeout` seconds under its filter signature.
+    """
+    estimate = estimated_row_count(queryset)
+    if estimate is not None:
+        return CountResult(estimate, estimated=True)
+
+    cap = cap if cap is not None else getattr(settings, 'COUNT_EXACT_CAP', 10000)
+    timeout = timeout if timeout is not None else getattr(settings, 'COUNT_CACHE_TIMEOUT', 30)
+
+    key = filter_signature(queryset)
+    result = cache.get(key)
+    if result is None:
+        # COUNT(*) over a LIMITed subquery stops after cap + 1 rows
+        value = queryset.order_by().values('pk')[:cap + 1].count()
+        result = CountResult(min(value, cap), capped=value > cap)
+        cache.set(key, result, timeout)
+    return result
@@ -0,0 +1,86 @@
+# student_mgmt/pagination.py
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.utils.functional import cached_property
+
+from .counts import count_rows, estimated_row_count
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids a full-table COUNT(*) on large unfiltered lists
+    Filtered querysets are still counted exactly.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = estimated_row_count(self.object_list)
+        if estimate is not None:
+            return estimate
+        return super().count
+
+
+class CountServicePage(Page):
+    """
+    Page of a CountServicePaginator whose count is not exact
+    has_next comes from the extra row fetched with the page, not from the
+    estimated number of pages.
+    """
+
+    def __init__(self, object_list, number, paginator, more):
+        super().__init__(object_list, number, paginator)
+        self.more = more
+
+    def has_next(self):
+        return self.more
+
+    def end_index(self):
+        return self.start_index() + len(self) - 1
+
+
+class CountServicePaginator(Paginator):
+    """
+    Paginator whose count comes from the count service
+    Estimated for unfiltered tables, capped and cached for filtered ones,
+    so rendering a page never needs a full scan. The count is a CountResult
+    and can be shown directly in templates ("10,000+").
+
+    When the count is not exact, page numbers aren't clamped to the
+    estimated number of pages; each page fetches one extra row instead to
+    tell whether another page follows.
+    """
+
+    @cached_property
+    def count(self):
+        return count_rows(self.object_list)
+
+    def validate_number(self, number):
+        if self.count.exact:
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def get_page(self, number):
+        if self.count.exact:
+            return super().get_page(number)
+        try:
+            return self.page(number)
+        except (PageNotAnInteger, EmptyPage):
+            # Past the real end; the estimated last page may be empty too
+            return self.page(1)
+
+    def page(self, number):
+        if self.count.exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages['no_results'])
+        return CountServicePage(rows[:self.per_page], number, self, more=len(rows) > self.per_page)
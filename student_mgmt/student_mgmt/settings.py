@@ -41,11 +41,13 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'accounts',
     'students',
-    
+    'jobs',
+    'tenancy',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'tenancy.middleware.TenantMiddleware',  # Before sessions/auth: they read the tenant DB
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -88,6 +90,19 @@ DATABASES = {
     }
 }
 
+# Multi-campus tenancy (see tenancy/tenants.py)
+# Each campus gets its own entry in DATABASES and in TENANTS, e.g.
+#   DATABASES['north'] = {**DATABASES['default'], 'NAME': 'student_mgmt_north', 'HOST': 'db-north'}
+#   TENANTS['north'] = {'hosts': ['north.campus.edu'], 'database': 'north'}
+# Run `manage.py migrate_tenants` to migrate every campus database.
+TENANTS = {}
+TENANT_REQUIRED = False  # True: 404 for requests that match no campus
+DATABASE_ROUTERS = ['tenancy.routers.TenantRouter']
+
+# Second campus database for tenancy/tests.py. Test databases are only
+# created for aliases a test asks for, so nothing else ever connects to it.
+DATABASES['campus_test'] = {**DATABASES['default'], 'TEST': {'NAME': 'test_student_mgmt_campus'}}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -108,6 +123,10 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password reset and cohort activation links stay valid for two weeks
+PASSWORD_RESET_TIMEOUT = 60 * 60 * 24 * 14
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -134,4 +153,44 @@ STATIC_ROOT = os.path.join(BASE_DIR,'staticfiles')
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
\ No newline at end of file
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Protected media serving (see students.media)
+# None: stream from Django with FileResponse (Range + conditional requests)
+# 'nginx': X-Accel-Redirect to an `internal` location aliased to MEDIA_ROOT
+# 'apache': X-Sendfile with the absolute path (mod_xsendfile)
+MEDIA_SENDFILE_BACKEND = None
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
+# Background jobs (see jobs app, run with `manage.py run_workers`)
+JOBS_DEFAULT_MAX_ATTEMPTS = 3
+JOBS_RETRY_BACKOFF_SECONDS = 30  # Doubled on every retry
+JOBS_RETRY_BACKOFF_MAX_SECONDS = 3600
+
+# Count service (see student_mgmt/counts.py)
+COUNT_EXACT_CAP = 10000  # Filtered counts above this show as "10,000+"
+COUNT_CACHE_TIMEOUT = 30  # Seconds a filtered count is reused
+
+# Sessions are read from the cache and written through to the database;
+# request.user is cached too (see accounts/sessions.py). Use a shared cache
+# (Redis/Memcached) with several server processes so that a User save
+# invalidates the cached user everywhere.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+SESSION_ENGINE = 'accounts.sessions'  # 'django.contrib.sessions.backends.db' to turn off
+SESSION_CACHE_ALIAS = 'default'
+# ModelBackend stays listed so sessions logged in before the cached backend
+# (which store its path in _auth_user_backend) remain valid
+AUTHENTICATION_BACKENDS = [
+    'accounts.sessions.CachedUserBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+USER_CACHE_ALIAS = 'default'
+USER_CACHE_TIMEOUT = 60  # Upper bound for changes that bypass User.save()
+
+# StudentForm copies department/year_of_admission/date_of_birth to the
+# linked User in the same transaction
+SYNC_STUDENT_USER_FIELDS = True
@@ -0,0 +1,170 @@
+# student_mgmt/uniqueness.py
+"""
+Uniqueness checks that cost one query, not one per field
+
+    find_taken(Student, {'student_id': 'S1', 'email': 'a@b.c'})
+    UniqueFieldsMixin                       # ModelForm.validate_unique() in one query
+    validate_batch(User, rows, ['username', 'roll_number'], lookups={'username': 'iexact'})
+
+validate_batch() checks a whole batch of rows with one query per
+batch_size rows. For bulk loads into a large table, a KeyPrefilter (a
+Bloom filter over the existing keys, built with one streaming scan) lets
+most new rows skip the database entirely: only keys the filter says
+might exist are looked up.
+"""
+import hashlib
+import math
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+
+def _matches(lookup, stored, value):
+    if lookup == 'iexact':
+        return str(stored).casefold() == str(value).casefold()
+    return stored == value
+
+
+def _key(lookup, value):
+    """The form of `value` that uniqueness is decided on (lowercased for 'iexact')"""
+    return str(value).lower() if lookup == 'iexact' else value
+
+
+def find_taken(model, values, exclude_pk=None, lookups=None):
+    """
+    Which of `values` ({field: value}) already exist on another row
+    `lookups` maps a field to the lookup to use ('exact' by default, e.g.
+    'iexact' for usernames). Returns {field: value} for the taken ones.
+    """
+    lookups = lookups or {}
+    values = {field: value for field, value in values.items() if value not in (None, '')}
+    if not values:
+        return {}
+    condition = Q()
+    for field, value in values.items():
+        condition |= Q(**{f"{field}__{lookups.get(field, 'exact')}": value})
+    rows = model._default_manager.filter(condition)
+    if exclude_pk is not None:
+        rows = rows.exclude(pk=exclude_pk)
+    fields = list(values)
+    taken = {}
+    for row in rows.values_list(*fields):
+        for field, stored in zip(fields, row):
+            if _matches(lookups.get(field, 'exact'), stored, values[field]):
+                taken[field] = values[field]
+    return taken
+
+
+class UniqueFieldsMixin:
+    """
+    ModelForm mixin: check every single-field unique constraint in one query
+    Set `unique_lookups` (e.g. {'username': 'iexact'}) for non-exact checks.
+    Other checks (unique_together, unique_for_date) go through Django as usual.
+    """
+    unique_lookups = {}
+
+    def validate_unique(self):
+        exclude = set(self._get_validation_exclusions())
+        instance = self.instance
+        fields = [
+            field for field in instance._meta.local_fields
+            if field.unique and not field.primary_key and field.name not in exclude
+        ]
+        taken = find_taken(
+            instance.__class__,
+            {field.name: getattr(instance, field.attname) for field in fields},
+            exclude_pk=None if instance._state.adding else instance.pk,
+            lookups=self.unique_lookups,
+        )
+        if taken:
+            self._update_errors(ValidationError({
+                field: instance.unique_error_message(instance.__class__, [field]) for field in taken
+            }))
+        try:
+            instance.validate_unique(exclude=exclude | {field.name for field in fields})
+        except ValidationError as e:
+            self._update_errors(e)
+
+
+class KeyPrefilter:
+    """
+    Bloom filter over the values of some unique fields of a table
+    `might_exist(field, value)` is never wrong when it says no; a yes still
+    needs a database check (false positives at roughly `error_rate`).
+    Fields with an 'iexact' entry in `lookups` are matched case-insensitively.
+    """
+
+    def __init__(self, model, fields, error_rate=0.01, chunk_size=5000, lookups=None):
+        self.fields = list(fields)
+        self.lookups = lookups or {}
+        rows = model._default_manager.values_list(*self.fields)
+        capacity = max(rows.count(), 1) * len(self.fields)
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        for row in rows.order_by().iterator(chunk_size=chunk_size):
+            for field, value in zip(self.fields, row):
+                if value not in (None, ''):
+                    self.add(field, value)
+
+    def _positions(self, field, value):
+        value = _key(self.lookups.get(field, 'exact'), value)
+        digest = hashlib.blake2b(f'{field}\0{value}'.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big')
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, field, value):
+        for position in self._positions(field, value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def might_exist(self, field, value):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(field, value))
+
+
+def validate_batch(model, rows, fields, batch_size=1000, prefilter=None, lookups=None):
+    """
+    Check a batch of row dicts against `fields`' uniqueness
+
+    Values repeated within `rows` and values already in the table are both
+    reported. `lookups` works as for find_taken(); only 'exact' and
+    'iexact' are supported. Returns {row index: {field: message}} for the
+    rows that clash. Pass a KeyPrefilter built over the same fields (and
+    lookups) to skip lookups for values that certainly don't exist yet.
+    """
+    lookups = lookups or {}
+    errors = {}
+    seen = {field: {} for field in fields}  # {field: {key: (index, value)}}
+    for index, row in enumerate(rows):
+        for field in fields:
+            value = row.get(field)
+            if value in (None, ''):
+                continue
+            key = _key(lookups.get(field, 'exact'), value)
+            if key in seen[field]:
+                errors.setdefault(index, {})[field] = f'Duplicate {field} {value!r} in batch'
+            else:
+                seen[field][key] = (index, value)
+
+    candidates = {
+        field: [key for key, (index, value) in keys.items()
+                if prefilter is None or prefilter.might_exist(field, value)]
+        for field, keys in seen.items()
+    }
+    folded = {f'{field}_key': Lower(field) for field in fields if lookups.get(field) == 'iexact'}
+    taken = set()
+    for start in range(0, max(map(len, candidates.values()), default=0), batch_size):
+        condition = Q()
+        for field, keys in candidates.items():
+            if keys[start:start + batch_size]:
+                lookup = f'{field}_key__in' if f'{field}_key' in folded else f'{field}__in'
+                condition |= Q(**{lookup: keys[start:start + batch_size]})
+        for row in model._default_manager.alias(**folded).filter(condition).values_list(*fields):
+            for field, stored in zip(fields, row):
+                taken.add((field, _key(lookups.get(field, 'exact'), stored)))
+
+    for field, keys in seen.items():
+        for key, (index, value) in keys.items():
+            if (field, key) in taken:
+                errors.setdefault(index, {})[field] = f'{field} {value!r} already exists'
+    return errors
@@ -1,14 +1,13 @@
 # student_mgmt/urls.py
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
-from django.conf.urls.static import static
+from students.views import protected_media_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('accounts.urls')),  # Include accounts URLs
-]
-
-# Serve media files in development
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    # Media files are permission-checked in Django, then handed to the
+    # front-end server (X-Accel-Redirect / X-Sendfile) when one is configured
+    re_path(r'^%s(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'), protected_media_view, name='protected_media'),
+]
\ No newline at end of file
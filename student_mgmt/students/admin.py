@@ -1,3 +1,89 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 
-# Register your models here.
+from student_mgmt.pagination import EstimatedCountPaginator
+from .archive import restore_students
+from .models import ArchivedStudent, Course, Enrollment, Grade, Student
+
+
+@admin.register(Student)
+class StudentAdmin(admin.ModelAdmin):
+    """
+    Admin for the Student table, built to stay fast at millions of rows
+    No full-table COUNT(*), no per-row user query, no <select> of every user.
+    """
+    list_display = ['student_id', 'first_name', 'last_name', 'email', 'department',
+                    'current_semester', 'status', 'gpa', 'user']
+    list_select_related = ['user']
+    list_filter = ['status', 'department']  # Both indexed
+    list_per_page = 50
+    raw_id_fields = ['user']
+
+    # Prefix lookups can use the varchar_pattern_ops indexes PostgreSQL
+    # keeps for these columns; icontains would scan the whole table.
+    search_fields = ['student_id__startswith', 'email__startswith', 'last_name__startswith']
+    search_help_text = 'Starts with: student ID, email or last name (case-sensitive)'
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    readonly_fields = ['gpa', 'gpa_credits', 'gpa_points', 'created_at', 'updated_at']
+
+
+@admin.register(Course)
+class CourseAdmin(admin.ModelAdmin):
+    list_display = ['code', 'title', 'department', 'credits']
+    list_filter = ['department']
+    search_fields = ['code__startswith', 'title__icontains']
+
+
+@admin.register(Enrollment)
+class EnrollmentAdmin(admin.ModelAdmin):
+    list_display = ['student', 'course', 'term', 'created_at']
+    list_select_related = ['student', 'course']
+    raw_id_fields = ['student', 'course']
+    search_fields = ['student__student_id__startswith', 'course__code__startswith']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Grade)
+class GradeAdmin(admin.ModelAdmin):
+    list_display = ['enrollment', 'letter', 'points', 'credits', 'graded_at']
+    list_select_related = ['enrollment__student', 'enrollment__course']
+    raw_id_fields = ['enrollment']
+    readonly_fields = ['points', 'credits', 'graded_at']
+    search_fields = ['enrollment__student__student_id__startswith']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_readonly_fields(self, request, obj=None):
+        # Record a new grade for a different enrollment instead of moving one
+        if obj is not None:
+            return ['enrollment', *self.readonly_fields]
+        return self.readonly_fields
+
+
+@admin.register(ArchivedStudent)
+class ArchivedStudentAdmin(admin.ModelAdmin):
+    """Read-only view of the archive; rows are moved by the archive_students command"""
+    list_display = ['student_id', 'first_name', 'last_name', 'email', 'department',
+                    'status', 'gpa', 'archived_at']
+    list_filter = ['status']
+    raw_id_fields = ['user']
+    search_fields = ['student_id__startswith', 'email__startswith', 'last_name__startswith']
+    search_help_text = 'Starts with: student ID, email or last name (case-sensitive)'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ['restore']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.action(permissions=['delete'], description='Restore selected students')
+    def restore(self, request, queryset):
+        restored, errors = restore_students(list(queryset.values_list('student_id', flat=True)))
+        for error in errors:
+            self.message_user(request, error, messages.WARNING)
+        self.message_user(request, f'{restored} student(s) restored.', messages.SUCCESS)
@@ -1,6 +1,24 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class StudentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'students'
+
+    def ready(self):
+        from .models import Grade, Student
+        from .gpa import remove_grade_contribution
+        from . import live
+
+        # A signal (not Grade.delete) so queryset and cascade deletes count too
+        post_delete.connect(
+            lambda sender, instance, **kwargs: remove_grade_contribution(instance),
+            sender=Grade, weak=False, dispatch_uid='students.grade_post_delete',
+        )
+
+        # Live admin dashboard updates
+        post_save.connect(live.student_saved, sender=Student,
+                          dispatch_uid='students.live_student_saved')
+        post_delete.connect(live.student_deleted, sender=Student,
+                            dispatch_uid='students.live_student_deleted')
@@ -0,0 +1,153 @@
+# students/archive.py
+"""
+Hot/cold split for the Student table
+
+Graduated and long-inactive students are moved, in batches, from Student
+(the hot table every list, search and dashboard query reads) into
+ArchivedStudent. Their enrollments and grades go with them as a JSON
+transcript, so the hot enrollment/grade tables shrink too. Archived
+students can be restored.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .gpa import suspend_gpa_updates
+from .models import ArchivedStudent, Course, Enrollment, Grade, Student
+
+
+def archive_candidates(statuses=('graduated',), inactive_days=365, admitted_before=None):
+    """Students eligible for archiving, oldest primary key first"""
+    cutoff = timezone.now() - timedelta(days=inactive_days)
+    candidates = Student.objects.filter(status__in=statuses, updated_at__lt=cutoff)
+    if admitted_before is not None:
+        candidates = candidates.filter(year_of_admission__lt=admitted_before)
+    return candidates.order_by('pk')
+
+
+def _transcripts(student_pks):
+    transcripts = defaultdict(list)
+    enrollments = Enrollment.objects.filter(student_id__in=student_pks).select_related('course', 'grade')
+    for enrollment in enrollments.order_by('term', 'course__code'):
+        grade = getattr(enrollment, 'grade', None)
+        transcripts[enrollment.student_id].append({
+            'course': enrollment.course.code,
+            'term': enrollment.term,
+            'grade': grade.letter if grade else None,
+            'credits': str(grade.credits) if grade else None,
+            'points': str(grade.points) if grade else None,
+        })
+    return transcripts
+
+
+def archive_batch(student_pks):
+    """Move one batch of students to ArchivedStudent in a single transaction"""
+    using = router.db_for_write(Student)
+    with transaction.atomic(using=using), suspend_gpa_updates():
+        locked = Student.objects.filter(pk__in=student_pks)
+        if connections[using].features.has_select_for_update_skip_locked:
+            # Rows being edited right now are left for the next run
+            locked = locked.select_for_update(skip_locked=True)
+        students = list(locked)
+        pks = [s.pk for s in students]
+        transcripts = _transcripts(pks)
+        ArchivedStudent.objects.bulk_create([
+            ArchivedStudent(
+                id=student.pk,
+                user_id=student.user_id,
+                transcript=transcripts[student.pk],
+                **{field: getattr(student, field) for field in ArchivedStudent.COPIED_FIELDS},
+            )
+            for student in students
+        ])
+        # Cascades to enrollments and grades, whose history is now in the transcript
+        Student.objects.filter(pk__in=pks).delete()
+    return len(pks)
+
+
+def archive_students(candidates, batch_size=1000, progress=None):
+    """Archive every student in `candidates`, batch by batch; returns the count"""
+    archived = 0
+    while True:
+        batch = list(candidates.values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return archived
+        moved = archive_batch(batch)
+        if not moved:
+            return archived  # Everything left is locked by other transactions
+        archived += moved
+        if progress:
+            progress(archived)
+
+
+def restore_students(student_ids):
+    """
+    Move archived students (by student_id) back into Student
+    Returns (restored count, list of error messages).
+    """
+    errors = []
+    archived = list(ArchivedStudent.objects.filter(student_id__in=student_ids))
+    found = {a.student_id for a in archived}
+    errors += [f'{sid}: not archived' for sid in student_ids if sid not in found]
+    # Hot rows that took an archived student's ID, email, account or pk meanwhile
+    clashing = Student.objects.filter(
+        Q(pk__in=[a.pk for a in archived])
+        | Q(student_id__in=[a.student_id for a in archived])
+        | Q(email__in=[a.email for a in archived])
+        | Q(user_id__in=[a.user_id for a in archived if a.user_id is not None])
+    ).values_list('pk', 'student_id', 'email', 'user_id')
+    taken = {'pk': set(), 'student_id': set(), 'email': set(), 'user_id': set()}
+    for row in clashing:
+        for key, value in zip(taken, row):
+            taken[key].add(value)
+
+    restorable = []
+    for record in archived:
+        if record.user_id is None:
+            errors.append(f'{record.student_id}: user account no longer exists')
+        elif record.student_id in taken['student_id']:
+            errors.append(f'{record.student_id}: student ID is now used by another student')
+        elif record.email in taken['email']:
+            errors.append(f'{record.student_id}: email {record.email} is now used by another student')
+        elif record.user_id in taken['user_id']:
+            errors.append(f'{record.student_id}: user account already has a new student profile')
+        elif record.pk in taken['pk']:
+            errors.append(f'{record.student_id}: primary key {record.pk} is in use')
+        else:
+            restorable.append(record)
+
+    courses = {c.code: c for c in Course.objects.filter(
+        code__in={entry['course'] for r in restorable for entry in r.transcript})}
+    with transaction.atomic(using=router.db_for_write(Student)):
+        students = Student.objects.bulk_create([
+            Student(id=r.id, user_id=r.user_id,
+                    **{field: getattr(r, field) for field in ArchivedStudent.COPIED_FIELDS})
+            for r in restorable
+        ])
+        # bulk_create stamps auto_now(_add) fields; put the original times back
+        for student, record in zip(students, restorable):
+            student.created_at, student.updated_at = record.created_at, record.updated_at
+        Student.objects.bulk_update(students, ['created_at', 'updated_at'])
+
+        enrollments, letters = [], []
+        for record in restorable:
+            for entry in record.transcript:
+                course = courses.get(entry['course'])
+                if course is None:
+                    errors.append(f"{record.student_id}: course {entry['course']} no longer exists")
+                    continue
+                enrollments.append(Enrollment(student_id=record.id, course=course, term=entry['term']))
+                letters.append(entry)
+        enrollments = Enrollment.objects.bulk_create(enrollments)
+        # Totals were copied from the archive row, so grades go in without deltas
+        Grade.objects.bulk_create([
+            Grade(enrollment=enrollment, letter=entry['grade'],
+                  points=Decimal(entry['points']), credits=Decimal(entry['credits']))
+            for enrollment, entry in zip(enrollments, letters) if entry['grade']
+        ])
+        ArchivedStudent.objects.filter(pk__in=[r.pk for r in restorable]).delete()
+    return len(restorable), errors
@@ -1,12 +1,16 @@
 # students/forms.py
 from django import forms
+from django.conf import settings
+from django.db import router, transaction
 from .models import Student
 from accounts.models import User
+from student_mgmt.uniqueness import UniqueFieldsMixin
 
-class StudentForm(forms.ModelForm):
+class StudentForm(UniqueFieldsMixin, forms.ModelForm):
     """
     Form for creating and updating student information
     ModelForm automatically creates form fields based on model fields
+    student_id and email uniqueness is checked in one query (UniqueFieldsMixin)
     """
     
     class Meta:
@@ -14,7 +18,7 @@ class StudentForm(forms.ModelForm):
         fields = [
             'student_id', 'first_name', 'last_name', 'email', 'phone_number',
             'department', 'year_of_admission', 'current_semester', 
-            'date_of_birth', 'address', 'profile_picture', 'status', 'gpa'
+            'date_of_birth', 'address', 'profile_picture', 'status'
         ]
         
         # Add Bootstrap CSS classes and HTML5 input types
@@ -31,13 +35,11 @@ class StudentForm(forms.ModelForm):
             'address': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
             'profile_picture': forms.FileInput(attrs={'class': 'form-control', 'accept': 'image/*'}),
             'status': forms.Select(attrs={'class': 'form-select'}),
-            'gpa': forms.NumberInput(attrs={'class': 'form-control', 'step': '0.01', 'min': '0', 'max': '4.00'}),
         }
         
         # Help texts for better UX
         help_texts = {
             'student_id': 'Unique identifier for the student (e.g., ST2024001)',
-            'gpa': 'GPA on a 4.0 scale',
             'profile_picture': 'Upload a profile picture (optional)',
         }
     
@@ -48,6 +50,20 @@ class StudentForm(forms.ModelForm):
         self.fields['last_name'].required = True
         self.fields['email'].required = True
         self.fields['student_id'].required = True
+    
+    def save(self, commit=True):
+        """
+        With settings.SYNC_STUDENT_USER_FIELDS, changes to department, year of
+        admission or date of birth are copied to the linked User in the same
+        transaction as the Student save
+        """
+        synced = set(Student.USER_SYNCED_FIELDS) & set(self.changed_data)
+        if not commit or not synced or not getattr(settings, 'SYNC_STUDENT_USER_FIELDS', False):
+            return super().save(commit)
+        with transaction.atomic(using=router.db_for_write(Student, instance=self.instance)):
+            student = super().save()
+            student.sync_user_fields()
+        return student
 
 class StudentSearchForm(forms.Form):
     """Form for searching students"""
@@ -73,4 +89,10 @@ class StudentSearchForm(forms.Form):
         choices=[('', 'All Status')] + Student.STATUS_CHOICES,
         required=False,
         widget=forms.Select(attrs={'class': 'form-select'})
-    )
\ No newline at end of file
+    )
+    
+    include_archived = forms.BooleanField(
+        required=False,
+        label='Include archived',
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
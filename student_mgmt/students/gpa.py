@@ -0,0 +1,210 @@
+# students/gpa.py
+"""
+GPA maintenance
+
+Each Student keeps two running totals:
+    gpa_credits = sum of credits over graded enrollments
+    gpa_points  = sum of credits * grade points
+and gpa = gpa_points / gpa_credits. Grade changes apply only their
+difference to these totals in a single UPDATE, so entering a grade costs
+the same for a first-year as for a student with years of history.
+recompute_gpa() rebuilds the totals from the grade history for audits.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import connections, router, transaction
+from django.db.models import Case, DecimalField, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast, Round
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
+
+from .models import Course, Enrollment, Grade, Student
+
+ZERO = Decimal('0')
+
+_updates_suspended = ContextVar('gpa_updates_suspended', default=False)
+
+
+@contextmanager
+def suspend_gpa_updates():
+    """
+    Skip per-grade totals updates while grades are deleted along with their
+    student (archiving), where adjusting a row that is going away is wasted work
+    """
+    token = _updates_suspended.set(True)
+    try:
+        yield
+    finally:
+        _updates_suspended.reset(token)
+
+
+def compute_gpa(credits, points):
+    if not credits:
+        return None
+    return (points / credits).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+def apply_gpa_delta(student_id, credits_delta, points_delta):
+    """Shift one student's totals and GPA in a single atomic UPDATE"""
+    if not credits_delta and not points_delta:
+        return
+    credits = F('gpa_credits') + Value(credits_delta)
+    points = F('gpa_points') + Value(points_delta)
+    dividend = points
+    if connections[router.db_for_write(Student)].vendor == 'sqlite':
+        # SQLite keeps whole-number decimals as integers and would divide
+        # them as integers; PostgreSQL numeric division is exact already
+        dividend = Cast(points, FloatField())
+    Student.objects.filter(pk=student_id).update(
+        gpa_credits=credits,
+        gpa_points=points,
+        # Right-hand sides see the old row, so the new GPA is built from
+        # the same expressions rather than the freshly assigned columns
+        gpa=Case(
+            When(GreaterThan(credits, 0), then=Round(dividend / credits, 2)),
+            default=None,
+            output_field=DecimalField(max_digits=3, decimal_places=2),
+        ),
+    )
+
+
+def remove_grade_contribution(grade):
+    """post_delete handler body: take a deleted grade out of the totals"""
+    if _updates_suspended.get():
+        return
+    credits, points = getattr(grade, '_counted', grade.contribution())
+    student_id = Enrollment.objects.filter(pk=grade.enrollment_id).values_list('student_id', flat=True).first()
+    if student_id is not None:
+        apply_gpa_delta(student_id, -credits, -points)
+
+
+def record_grades(rows):
+    """
+    Bulk-record grades from (student_id, course_code, term, letter) rows
+
+    Enrollments are created as needed, grades are inserted or updated with
+    bulk_create/bulk_update, and each affected student's totals are updated
+    once with the summed difference. Returns a dict of counts and a list of
+    (row number, message) errors for rows that were skipped.
+    """
+    rows = list(rows)
+    errors = []
+    student_ids = {row[0] for row in rows}
+    course_codes = {row[1] for row in rows}
+    students = dict(Student.objects.filter(student_id__in=student_ids).values_list('student_id', 'pk'))
+    courses = {c.code: c for c in Course.objects.filter(code__in=course_codes)}
+
+    # Validate first so bad rows don't touch the database
+    wanted = {}
+    for number, (student_id, course_code, term, letter) in enumerate(rows, start=1):
+        letter = letter.strip().upper()
+        if student_id not in students:
+            errors.append((number, f'Unknown student {student_id!r}'))
+        elif course_code not in courses:
+            errors.append((number, f'Unknown course {course_code!r}'))
+        elif letter not in Grade.GRADE_POINTS:
+            errors.append((number, f'Invalid grade {letter!r}'))
+        else:
+            # A later row for the same enrollment wins
+            wanted[(students[student_id], courses[course_code].pk, term)] = letter
+
+    created = updated = 0
+    deltas = defaultdict(lambda: [ZERO, ZERO])
+    with transaction.atomic(using=router.db_for_write(Grade)):
+        enrollments = {
+            (e.student_id, e.course_id, e.term): e
+            for e in Enrollment.objects.filter(
+                student_id__in={key[0] for key in wanted},
+                course_id__in={key[1] for key in wanted},
+                term__in={key[2] for key in wanted},
+            )
+        }
+        missing = [Enrollment(student_id=s, course_id=c, term=t)
+                   for (s, c, t) in wanted if (s, c, t) not in enrollments]
+        for enrollment in Enrollment.objects.bulk_create(missing):
+            enrollments[(enrollment.student_id, enrollment.course_id, enrollment.term)] = enrollment
+
+        existing = {g.enrollment_id: g for g in Grade.objects.filter(
+            enrollment_id__in=[e.pk for e in enrollments.values()])}
+        credits_by_course = {c.pk: c.credits for c in courses.values()}
+
+        to_create, to_update = [], []
+        for key, letter in wanted.items():
+            enrollment = enrollments[key]
+            grade = existing.get(enrollment.pk)
+            if grade is None:
+                grade = Grade(enrollment=enrollment, credits=credits_by_course[key[1]])
+                old = (ZERO, ZERO)
+                to_create.append(grade)
+            else:
+                old = grade._counted
+                grade.graded_at = timezone.now()
+                to_update.append(grade)
+            grade.letter = letter
+            grade.points = Decimal(Grade.GRADE_POINTS[letter])
+            new = grade.contribution()
+            deltas[key[0]][0] += new[0] - old[0]
+            deltas[key[0]][1] += new[1] - old[1]
+
+        Grade.objects.bulk_create(to_create)
+        Grade.objects.bulk_update(to_update, ['letter', 'points', 'graded_at'])
+        created, updated = len(to_create), len(to_update)
+
+        for student_pk, (credits_delta, points_delta) in deltas.items():
+            apply_gpa_delta(student_pk, credits_delta, points_delta)
+
+    return {'created': created, 'updated': updated, 'students': len(deltas), 'errors': errors}
+
+
+def recompute_gpa(fix=True, chunk_size=2000):
+    """
+    Rebuild every student's totals from the full grade history
+    Returns the list of (student, stored, expected) mismatches found, where
+    stored/expected are (credits, points, gpa) tuples.
+
+    Students are handled in pk-ordered chunks. With fix=True each chunk is
+    locked (select_for_update) and its sums are taken inside the same
+    transaction, so a grade saved concurrently either is in the sums or
+    applies its delta after the corrected totals are written.
+    """
+    mismatches = []
+    using = router.db_for_write(Student)
+    last_pk = None
+    while True:
+        with transaction.atomic(using=using):
+            students = Student.objects.only('pk', 'student_id', 'gpa', 'gpa_credits', 'gpa_points').order_by('pk')
+            if last_pk is not None:
+                students = students.filter(pk__gt=last_pk)
+            if fix:
+                students = students.select_for_update()
+            students = list(students[:chunk_size])
+            if not students:
+                return mismatches
+            last_pk = students[-1].pk
+
+            totals = {
+                row['enrollment__student_id']: (row['total_credits'], row['total_points'])
+                for row in Grade.objects.filter(
+                    enrollment__student_id__in=[student.pk for student in students],
+                ).values('enrollment__student_id').annotate(
+                    total_credits=Sum('credits'),
+                    total_points=Sum(F('credits') * F('points'),
+                                     output_field=DecimalField(max_digits=8, decimal_places=2)),
+                ).order_by()
+            }
+
+            to_fix = []
+            for student in students:
+                credits, points = totals.get(student.pk, (ZERO, ZERO))
+                expected = (Decimal(credits), Decimal(points), compute_gpa(Decimal(credits), Decimal(points)))
+                stored = (student.gpa_credits, student.gpa_points, student.gpa)
+                if stored != expected:
+                    mismatches.append((student, stored, expected))
+                    student.gpa_credits, student.gpa_points, student.gpa = expected
+                    to_fix.append(student)
+
+            if fix and to_fix:
+                Student.objects.bulk_update(to_fix, ['gpa_credits', 'gpa_points', 'gpa'])
@@ -0,0 +1,54 @@
+# students/management/commands/archive_students.py
+from django.core.management.base import BaseCommand
+
+from students.archive import archive_candidates, archive_students, restore_students
+from tenancy.tenants import use_tenant
+
+
+class Command(BaseCommand):
+    help = 'Move graduated/inactive students to the archive table, or restore them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--status', nargs='+', default=['graduated'],
+                            choices=['graduated', 'inactive', 'suspended'],
+                            help='Statuses to archive (default: graduated)')
+        parser.add_argument('--inactive-days', type=int, default=365,
+                            help='Only students not updated for this many days (default: 365)')
+        parser.add_argument('--admitted-before', type=int, metavar='YEAR',
+                            help='Only students admitted before this year')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Students moved per transaction (default: 1000)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report how many students would be archived')
+        parser.add_argument('--restore', nargs='+', metavar='STUDENT_ID',
+                            help='Move these archived students back instead')
+        parser.add_argument('--tenant',
+                            help='Campus whose students to archive or restore (default: the default database)')
+
+    def handle(self, *args, **options):
+        with use_tenant(options['tenant']):
+            self.run(**options)
+
+    def run(self, **options):
+        if options['restore']:
+            restored, errors = restore_students(options['restore'])
+            for message in errors:
+                self.stderr.write(message)
+            self.stdout.write(self.style.SUCCESS(f'{restored} student(s) restored'))
+            return
+
+        candidates = archive_candidates(
+            statuses=options['status'],
+            inactive_days=options['inactive_days'],
+            admitted_before=options['admitted_before'],
+        )
+        if options['dry_run']:
+            self.stdout.write(f'{candidates.count()} student(s) would be archived')
+            return
+
+        archived = archive_students(
+            candidates,
+            batch_size=options['batch_size'],
+            progress=lambda done: self.stdout.write(f'  {done} archived'),
+        )
+        self.stdout.write(self.style.SUCCESS(f'{archived} student(s) archived'))
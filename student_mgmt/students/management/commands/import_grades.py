@@ -0,0 +1,47 @@
+# students/management/commands/import_grades.py
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from students.gpa import record_grades
+from tenancy.tenants import use_tenant
+
+
+class Command(BaseCommand):
+    help = 'Bulk-record grades from a CSV with student_id, course_code, term, grade columns'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='Path to the grades CSV (with a header row)')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows written per transaction')
+        parser.add_argument('--tenant', help='Campus whose grades to record (default: the default database)')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_file'], newline='', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                rows = [
+                    (r['student_id'].strip(), r['course_code'].strip(), r['term'].strip(), r['grade'])
+                    for r in reader
+                ]
+        except (OSError, KeyError) as e:
+            raise CommandError(f'Could not read grades file: {e}')
+
+        started = time.monotonic()
+        totals = {'created': 0, 'updated': 0, 'students': 0}
+        batch_size = options['batch_size']
+        with use_tenant(options['tenant']):
+            for start in range(0, len(rows), batch_size):
+                result = record_grades(rows[start:start + batch_size])
+                for key in totals:
+                    totals[key] += result[key]
+                for number, message in result['errors']:
+                    # +1 for the header row
+                    self.stderr.write(f'Line {start + number + 1}: {message}')
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['created']} grade(s) created, {totals['updated']} updated "
+            f"for {totals['students']} student(s) in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,28 @@
+# students/management/commands/recompute_gpa.py
+from django.core.management.base import BaseCommand
+
+from students.gpa import recompute_gpa
+from tenancy.tenants import use_tenant
+
+
+class Command(BaseCommand):
+    help = "Audit every student's GPA totals against the full grade history"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report mismatches without correcting them')
+        parser.add_argument('--tenant', help='Campus whose GPAs to audit (default: the default database)')
+
+    def handle(self, *args, **options):
+        with use_tenant(options['tenant']):
+            mismatches = recompute_gpa(fix=not options['dry_run'])
+        for student, stored, expected in mismatches:
+            self.stdout.write(
+                f'{student.student_id}: stored credits/points/GPA {stored}, expected {expected}'
+            )
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS('All GPA totals match the grade history'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{len(mismatches)} mismatch(es) found'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{len(mismatches)} student(s) corrected'))
@@ -0,0 +1,107 @@
+# students/management/commands/startup_profile.py
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter under -X importtime, so nothing is imported
+# yet; phase timings go to stdout as JSON, the import log to stderr.
+BOOT_SCRIPT = r'''
+import json, sys, time
+from wsgiref.util import setup_testing_defaults
+
+path, host = sys.argv[1], sys.argv[2]
+timings, started = {}, time.perf_counter()
+
+def phase(name, since):
+    now = time.perf_counter()
+    timings[name] = round((now - since) * 1000, 1)
+    return now
+
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+mark = phase('settings', started)
+django.setup()
+mark = phase('django.setup()', mark)
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+mark = phase('WSGI handler', mark)
+
+statuses = []
+def request():
+    environ = {'PATH_INFO': path, 'HTTP_HOST': host}
+    setup_testing_defaults(environ)
+    response = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    b''.join(response)
+    getattr(response, 'close', lambda: None)()
+
+request()
+mark = phase('first request', mark)
+timings['ready to serve'] = round((mark - started) * 1000, 1)
+request()
+phase('second request', mark)
+print(json.dumps({'timings': timings, 'statuses': statuses}))
+'''
+
+IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+class Command(BaseCommand):
+    help = 'Profile a cold worker start: import time per app and module, and time to first request'
+    requires_system_checks = []  # Checks import more (e.g. Pillow) than a serving worker does
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/', help='URL path for the first request (default: /)')
+        parser.add_argument('--host', default='localhost', help='Host header for the requests')
+        parser.add_argument('--top', type=int, default=20,
+                            help='Number of slowest modules to list (default: 20)')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, sys.path)))
+        child = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT, options['path'], options['host']],
+            capture_output=True, text=True, env=env,
+        )
+        if child.returncode:
+            raise CommandError(f'Startup failed:\n{child.stderr[-3000:]}')
+        result = json.loads(child.stdout.strip().splitlines()[-1])
+
+        modules = []  # (name, self µs, cumulative µs, depth)
+        for line in child.stderr.splitlines():
+            match = IMPORT_LINE.match(line)
+            if match:
+                own, cumulative, indent, name = match.groups()
+                modules.append((name, int(own), int(cumulative), len(indent) // 2))
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Startup phases'))
+        for name, ms in result['timings'].items():
+            self.stdout.write(f'  {name:<20} {ms:>9.1f} ms')
+        self.stdout.write(f"  Response status(es): {', '.join(result['statuses'])}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Import time by app/package (own time of its modules)'))
+        by_package = defaultdict(int)
+        for name, own, cumulative, depth in modules:
+            by_package[self._package(name)] += own
+        total = sum(by_package.values()) or 1
+        for package, own in sorted(by_package.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f'  {package:<32} {own / 1000:>9.1f} ms  {100 * own / total:5.1f}%')
+        self.stdout.write(f"  {'total':<32} {total / 1000:>9.1f} ms")
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Slowest modules (including their imports)'))
+        for name, own, cumulative, depth in sorted(modules, key=lambda m: -m[2])[:options['top']]:
+            self.stdout.write(f'  {name:<48} {cumulative / 1000:>9.1f} ms  (own {own / 1000:.1f} ms)')
+
+    def _package(self, module):
+        """Group modules by installed app (e.g. django.contrib.admin) or top-level package"""
+        if not hasattr(self, '_app_names'):
+            self._app_names = sorted((config.name for config in apps.get_app_configs()), key=len, reverse=True)
+        for name in self._app_names:
+            if module == name or module.startswith(name + '.'):
+                return name
+        return module.split('.')[0]
@@ -0,0 +1,148 @@
+# students/media.py
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.core.exceptions import SuspiciousFileOperation
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """
+    Read-limited view of an open file, used as the body of a 206 response.
+    Keeps fileno() so WSGI servers with wsgi.file_wrapper can still sendfile()
+    the slice instead of copying it through Python.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def resolve_media_path(name):
+    """Return the absolute path of a file under MEDIA_ROOT, or raise Http404"""
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404('Invalid media path')
+    if not os.path.isfile(full_path):
+        raise Http404('Media file not found')
+    return full_path
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range "Range: bytes=..." header
+    Returns (start, end) inclusive, None to serve the whole file,
+    or False if the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None  # Multiple or malformed ranges: ignore and send 200
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+def serve_media(request, name):
+    """
+    Build the response for an already-authorized media file
+
+    With MEDIA_SENDFILE_BACKEND set, only headers are returned and the
+    front-end server (nginx / Apache mod_xsendfile) sends the body itself,
+    including Range handling. Otherwise a FileResponse is returned with
+    conditional-request and single-range support.
+    """
+    full_path = resolve_media_path(name)
+    backend = getattr(settings, 'MEDIA_SENDFILE_BACKEND', None)
+
+    # Both servers URL-decode these headers; percent-encoding also keeps
+    # non-ASCII file names out of Django's latin-1/RFC 2047 header encoding
+    if backend == 'nginx':
+        response = HttpResponse(content_type='')
+        prefix = settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip('/')
+        response['X-Accel-Redirect'] = quote(f"{prefix}/{name.lstrip('/')}")
+        return response
+    if backend == 'apache':
+        response = HttpResponse(content_type='')
+        response['X-Sendfile'] = quote(full_path)
+        return response
+
+    stat = os.stat(full_path)
+    size = stat.st_size
+    last_modified = int(stat.st_mtime)
+    etag = f'"{last_modified:x}-{size:x}"'
+
+    # 304 / 412 for If-None-Match, If-Modified-Since and friends
+    conditional = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if conditional is not None:
+        return conditional
+
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    if range_header and request.method in ('GET', 'HEAD') and _if_range_passes(request, etag, last_modified):
+        byte_range = parse_range(range_header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    file = open(full_path, 'rb')
+    if byte_range is None:
+        response = FileResponse(file)
+    else:
+        start, end = byte_range
+        response = FileResponse(FileRange(file, start, end - start + 1), status=206)
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'private'
+    return response
+
+
+def _if_range_passes(request, etag, last_modified):
+    """A stale If-Range validator means the whole file must be sent"""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
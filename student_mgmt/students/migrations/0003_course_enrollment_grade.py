@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:49
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0002_student_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Course',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(help_text='e.g., CS101', max_length=20, unique=True)),
+                ('title', models.CharField(max_length=200)),
+                ('department', models.CharField(db_index=True, max_length=100)),
+                ('credits', models.DecimalField(decimal_places=1, help_text='Credit hours, used to weight the GPA', max_digits=3, validators=[django.core.validators.MinValueValidator(0)])),
+            ],
+            options={
+                'ordering': ['code'],
+            },
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='gpa_credits',
+            field=models.DecimalField(decimal_places=1, default=0, editable=False, max_digits=6),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='gpa_points',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=8),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='gpa',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=3, null=True),
+        ),
+        migrations.CreateModel(
+            name='Enrollment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(help_text='e.g., 2024-FALL', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='enrollments', to='students.course')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to='students.student')),
+            ],
+            options={
+                'ordering': ['-term', 'course__code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Grade',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('letter', models.CharField(choices=[('A', 'A'), ('A-', 'A-'), ('B+', 'B+'), ('B', 'B'), ('B-', 'B-'), ('C+', 'C+'), ('C', 'C'), ('C-', 'C-'), ('D+', 'D+'), ('D', 'D'), ('F', 'F')], max_length=2)),
+                ('points', models.DecimalField(decimal_places=2, editable=False, max_digits=3)),
+                ('credits', models.DecimalField(decimal_places=1, editable=False, max_digits=3)),
+                ('graded_at', models.DateTimeField(auto_now=True)),
+                ('enrollment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='grade', to='students.enrollment')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='enrollment',
+            constraint=models.UniqueConstraint(fields=('student', 'course', 'term'), name='unique_enrollment'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0003_course_enrollment_grade'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedStudent',
+            fields=[
+                ('id', models.BigIntegerField(help_text='Primary key the row had in Student', primary_key=True, serialize=False)),
+                ('student_id', models.CharField(max_length=20, unique=True)),
+                ('first_name', models.CharField(max_length=50)),
+                ('last_name', models.CharField(db_index=True, max_length=50)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('phone_number', models.CharField(blank=True, max_length=15)),
+                ('department', models.CharField(max_length=100)),
+                ('year_of_admission', models.IntegerField()),
+                ('current_semester', models.IntegerField()),
+                ('date_of_birth', models.DateField()),
+                ('address', models.TextField(blank=True)),
+                ('profile_picture', models.ImageField(blank=True, null=True, upload_to='student_profiles/')),
+                ('status', models.CharField(choices=[('active', 'Active'), ('inactive', 'Inactive'), ('graduated', 'Graduated'), ('suspended', 'Suspended')], max_length=10)),
+                ('gpa', models.DecimalField(blank=True, decimal_places=2, max_digits=3, null=True)),
+                ('gpa_credits', models.DecimalField(decimal_places=1, default=0, max_digits=6)),
+                ('gpa_points', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('transcript', models.JSONField(blank=True, default=list)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_student_profile', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived student',
+                'verbose_name_plural': 'Archived students',
+                'ordering': ['student_id'],
+            },
+        ),
+    ]
@@ -1,7 +1,10 @@
 # students/models.py
-from django.db import models
+from decimal import Decimal
+
+from django.db import models, router, transaction
 from django.conf import settings
 from django.urls import reverse
+from django.core.validators import MinValueValidator
 
 class Student(models.Model):
     """
@@ -18,12 +21,12 @@ class Student(models.Model):
     # Academic Information
     student_id = models.CharField(max_length=20, unique=True, help_text="Unique student ID")
     first_name = models.CharField(max_length=50)
-    last_name = models.CharField(max_length=50)
+    last_name = models.CharField(max_length=50, db_index=True)
     email = models.EmailField(unique=True)
     phone_number = models.CharField(max_length=15, blank=True)
     
     # Academic Details
-    department = models.CharField(max_length=100)
+    department = models.CharField(max_length=100, db_index=True)
     year_of_admission = models.IntegerField()
     current_semester = models.IntegerField(default=1)
     
@@ -44,10 +47,16 @@ class Student(models.Model):
         ('graduated', 'Graduated'),
         ('suspended', 'Suspended'),
     ]
-    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='active')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='active', db_index=True)
     
-    # GPA tracking
-    gpa = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True)
+    # GPA tracking - running totals maintained by Grade (see students/gpa.py)
+    # gpa = gpa_points / gpa_credits, never edited by hand
+    gpa = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True, editable=False)
+    gpa_credits = models.DecimalField(max_digits=6, decimal_places=1, default=0, editable=False)
+    gpa_points = models.DecimalField(max_digits=8, decimal_places=2, default=0, editable=False)
+    GPA_FIELDS = ('gpa', 'gpa_credits', 'gpa_points')
+    # Also stored on the linked User (see sync_user_fields)
+    USER_SYNCED_FIELDS = ('department', 'year_of_admission', 'date_of_birth')
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -61,6 +70,39 @@ class Student(models.Model):
     def __str__(self):
         return f"{self.student_id} - {self.first_name} {self.last_name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored values, so live dashboard updates can send deltas (students/live.py)
+        if 'status' in field_names and 'department' in field_names:
+            instance._live_loaded = (instance.status, instance.department)
+        return instance
+    
+    def save(self, *args, **kwargs):
+        # GPA columns are owned by Grade (students/gpa.py); an edit form
+        # holding an older copy of the row must not write them back
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.GPA_FIELDS
+                and f.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+    
+    def sync_user_fields(self):
+        """Copy USER_SYNCED_FIELDS to the linked User in a single UPDATE"""
+        from accounts.sessions import forget_cached_user
+
+        if self.user_id is None:
+            return
+        users = self._meta.get_field('user').related_model._default_manager
+        using = router.db_for_write(type(self), instance=self)
+        users.using(using).filter(pk=self.user_id).update(
+            **{field: getattr(self, field) for field in self.USER_SYNCED_FIELDS}
+        )
+        forget_cached_user(self.user_id, using)  # update() sends no post_save
+    
     def get_full_name(self):
         """Return the full name"""
         return f"{self.first_name} {self.last_name}"
@@ -74,4 +116,161 @@ class Student(models.Model):
         """Calculate age from date of birth"""
         from datetime import date
         today = date.today()
-        return today.year - self.date_of_birth.year - ((today.month, today.day) < (self.date_of_birth.month, self.date_of_birth.day))
\ No newline at end of file
+        return today.year - self.date_of_birth.year - ((today.month, today.day) < (self.date_of_birth.month, self.date_of_birth.day))
+
+
+class ArchivedStudent(models.Model):
+    """
+    Cold storage for graduated/inactive students (see students/archive.py)
+    Rows keep the original Student primary key, and the grade history is
+    kept as a transcript so enrollments don't stay in the hot tables.
+    """
+    # Fields copied one-to-one from Student when archiving
+    COPIED_FIELDS = [
+        'student_id', 'first_name', 'last_name', 'email', 'phone_number',
+        'department', 'year_of_admission', 'current_semester', 'date_of_birth',
+        'address', 'profile_picture', 'status', 'gpa', 'gpa_credits', 'gpa_points',
+        'created_at', 'updated_at',
+    ]
+
+    id = models.BigIntegerField(primary_key=True, help_text="Primary key the row had in Student")
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='archived_student_profile'
+    )
+
+    student_id = models.CharField(max_length=20, unique=True)
+    first_name = models.CharField(max_length=50)
+    last_name = models.CharField(max_length=50, db_index=True)
+    email = models.EmailField(unique=True)
+    phone_number = models.CharField(max_length=15, blank=True)
+    department = models.CharField(max_length=100)
+    year_of_admission = models.IntegerField()
+    current_semester = models.IntegerField()
+    date_of_birth = models.DateField()
+    address = models.TextField(blank=True)
+    profile_picture = models.ImageField(upload_to='student_profiles/', blank=True, null=True)
+    status = models.CharField(max_length=10, choices=Student.STATUS_CHOICES)
+    gpa = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True)
+    gpa_credits = models.DecimalField(max_digits=6, decimal_places=1, default=0)
+    gpa_points = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    # Original timestamps, not auto-managed here
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    # [{"course": "CS101", "term": "2024-FALL", "grade": "A", "credits": "4.0", "points": "4.00"}, ...]
+    transcript = models.JSONField(default=list, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['student_id']
+        verbose_name = 'Archived student'
+        verbose_name_plural = 'Archived students'
+
+    def __str__(self):
+        return f"{self.student_id} - {self.first_name} {self.last_name} (archived)"
+
+    def get_full_name(self):
+        return f"{self.first_name} {self.last_name}"
+
+
+class Course(models.Model):
+    """A course students can enroll in"""
+    code = models.CharField(max_length=20, unique=True, help_text="e.g., CS101")
+    title = models.CharField(max_length=200)
+    department = models.CharField(max_length=100, db_index=True)
+    credits = models.DecimalField(
+        max_digits=3, decimal_places=1, validators=[MinValueValidator(0)],
+        help_text="Credit hours, used to weight the GPA"
+    )
+
+    class Meta:
+        ordering = ['code']
+
+    def __str__(self):
+        return f"{self.code} - {self.title}"
+
+
+class Enrollment(models.Model):
+    """A student taking a course in a given term"""
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='enrollments')
+    course = models.ForeignKey(Course, on_delete=models.PROTECT, related_name='enrollments')
+    term = models.CharField(max_length=20, help_text="e.g., 2024-FALL")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-term', 'course__code']
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'course', 'term'], name='unique_enrollment'),
+        ]
+
+    def __str__(self):
+        return f"{self.student.student_id} in {self.course.code} ({self.term})"
+
+
+class Grade(models.Model):
+    """
+    Final grade for an enrollment
+    Saving or deleting a grade adjusts the student's GPA running totals
+    by the difference only, so it costs O(1) regardless of history size.
+    """
+    GRADE_POINTS = {
+        'A': '4.00', 'A-': '3.70',
+        'B+': '3.30', 'B': '3.00', 'B-': '2.70',
+        'C+': '2.30', 'C': '2.00', 'C-': '1.70',
+        'D+': '1.30', 'D': '1.00',
+        'F': '0.00',
+    }
+    LETTER_CHOICES = [(letter, letter) for letter in GRADE_POINTS]
+
+    enrollment = models.OneToOneField(Enrollment, on_delete=models.CASCADE, related_name='grade')
+    letter = models.CharField(max_length=2, choices=LETTER_CHOICES)
+    points = models.DecimalField(max_digits=3, decimal_places=2, editable=False)
+    # Credits counted for this grade, copied from the course when graded
+    credits = models.DecimalField(max_digits=3, decimal_places=1, editable=False)
+    graded_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.enrollment} - {self.letter}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what is already counted in the student's totals, and where
+        instance._counted = instance.contribution()
+        instance._counted_enrollment_id = instance.enrollment_id
+        return instance
+
+    def contribution(self):
+        """(credits, points) this grade adds to the student's totals"""
+        if self.credits is None or self.points is None:
+            return (Decimal('0'), Decimal('0'))
+        return (self.credits, self.credits * self.points)
+
+    def save(self, *args, **kwargs):
+        from .gpa import apply_gpa_delta
+        old_enrollment_id = getattr(self, '_counted_enrollment_id', None)
+        moved = old_enrollment_id is not None and old_enrollment_id != self.enrollment_id
+        self.points = Decimal(self.GRADE_POINTS[self.letter])
+        if self.credits is None or moved:
+            self.credits = self.enrollment.course.credits
+        old_credits, old_points = getattr(self, '_counted', (Decimal('0'), Decimal('0')))
+        new_credits, new_points = self.contribution()
+        with transaction.atomic(using=kwargs.get('using') or router.db_for_write(Grade, instance=self)):
+            super().save(*args, **kwargs)
+            if moved:
+                # Reassigned to another enrollment: the old student loses the
+                # whole old contribution and the new one gains the new one
+                old_student_id = Enrollment.objects.filter(pk=old_enrollment_id).values_list(
+                    'student_id', flat=True).first()
+                if old_student_id is not None:
+                    apply_gpa_delta(old_student_id, -old_credits, -old_points)
+                apply_gpa_delta(self.enrollment.student_id, new_credits, new_points)
+            else:
+                apply_gpa_delta(self.enrollment.student_id,
+                                new_credits - old_credits, new_points - old_points)
+        self._counted = (new_credits, new_points)
+        self._counted_enrollment_id = self.enrollment_id
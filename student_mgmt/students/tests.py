@@ -1,3 +1,286 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from datetime import date
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+
+from accounts.models import User
+from student_mgmt.pagination import CountServicePaginator
+from .archive import archive_batch, restore_students
+from .forms import StudentForm
+from .gpa import recompute_gpa, record_grades
+from .media import parse_range, serve_media
+from .models import ArchivedStudent, Course, Enrollment, Grade, Student
+
+
+def make_student(student_id, username=None, **extra):
+    user = User.objects.create_user(username=username or student_id.lower(), password='x')
+    return Student.objects.create(
+        user=user, student_id=student_id, first_name='Test', last_name=student_id,
+        email=f'{student_id.lower()}@example.com', department='CS',
+        year_of_admission=2022, date_of_birth=date(2004, 1, 1), **extra,
+    )
+
+
+class GPATotalsTests(TestCase):
+    def setUp(self):
+        self.student = make_student('S1')
+        self.other = make_student('S2')
+        self.cs101 = Course.objects.create(code='CS101', title='Intro', department='CS', credits=4)
+        self.cs102 = Course.objects.create(code='CS102', title='Data', department='CS', credits=3)
+
+    def assertTotals(self, student, credits, points, gpa):
+        student.refresh_from_db()
+        self.assertEqual(
+            (student.gpa_credits, student.gpa_points, student.gpa),
+            (Decimal(credits), Decimal(points), Decimal(gpa) if gpa is not None else None),
+        )
+
+    def grade(self, student, course, letter, term='2024-FALL'):
+        enrollment = Enrollment.objects.create(student=student, course=course, term=term)
+        return Grade.objects.create(enrollment=enrollment, letter=letter)
+
+    def test_insert_change_and_delete_apply_deltas(self):
+        grade = self.grade(self.student, self.cs101, 'A')
+        self.assertTotals(self.student, '4.0', '16.00', '4.00')
+        self.grade(self.student, self.cs102, 'C')
+        self.assertTotals(self.student, '7.0', '22.00', '3.14')
+
+        grade = Grade.objects.get(pk=grade.pk)
+        grade.letter = 'B'
+        grade.save()
+        self.assertTotals(self.student, '7.0', '18.00', '2.57')
+
+        grade.delete()
+        self.assertTotals(self.student, '3.0', '6.00', '2.00')
+
+    def test_cascade_delete_through_enrollment(self):
+        grade = self.grade(self.student, self.cs101, 'A')
+        self.grade(self.student, self.cs102, 'B')
+        grade.enrollment.delete()
+        self.assertTotals(self.student, '3.0', '9.00', '3.00')
+        Enrollment.objects.filter(student=self.student).delete()
+        self.assertTotals(self.student, '0.0', '0.00', None)
+
+    def test_moving_a_grade_to_another_enrollment(self):
+        self.grade(self.student, self.cs101, 'A')
+        grade = self.grade(self.student, self.cs102, 'B')
+        grade = Grade.objects.get(pk=grade.pk)
+        grade.enrollment = Enrollment.objects.create(student=self.other, course=self.cs101, term='2024-FALL')
+        grade.save()
+        self.assertTotals(self.student, '4.0', '16.00', '4.00')
+        # Credits follow the new course
+        self.assertTotals(self.other, '4.0', '12.00', '3.00')
+        self.assertEqual(recompute_gpa(fix=False), [])
+
+    def test_record_grades_dedupes_and_updates(self):
+        result = record_grades([
+            ('S1', 'CS101', '2024-FALL', 'C'),
+            ('S1', 'CS101', '2024-FALL', 'a'),  # Later row for the same enrollment wins
+            ('S2', 'CS102', '2024-FALL', 'B'),
+            ('S9', 'CS101', '2024-FALL', 'A'),
+            ('S1', 'CS102', '2024-FALL', 'Z'),
+        ])
+        self.assertEqual((result['created'], result['updated'], result['students']), (2, 0, 2))
+        self.assertEqual([number for number, message in result['errors']], [4, 5])
+        self.assertEqual(Enrollment.objects.filter(student=self.student).count(), 1)
+        self.assertTotals(self.student, '4.0', '16.00', '4.00')
+        self.assertTotals(self.other, '3.0', '9.00', '3.00')
+
+        result = record_grades([('S1', 'CS101', '2024-FALL', 'B'), ('S1', 'CS102', '2024-FALL', 'A')])
+        self.assertEqual((result['created'], result['updated']), (1, 1))
+        self.assertTotals(self.student, '7.0', '24.00', '3.43')
+        self.assertEqual(recompute_gpa(fix=False), [])
+
+    def test_recompute_fixes_drifted_row(self):
+        self.grade(self.student, self.cs101, 'A')
+        Student.objects.filter(pk=self.student.pk).update(gpa_credits=9, gpa_points=1, gpa=Decimal('0.11'))
+        mismatches = recompute_gpa(chunk_size=1)
+        self.assertEqual([student.pk for student, stored, expected in mismatches], [self.student.pk])
+        self.assertTotals(self.student, '4.0', '16.00', '4.00')
+        self.assertEqual(recompute_gpa(fix=False), [])
+
+
+class RestoreTests(TestCase):
+    def setUp(self):
+        self.student = make_student('S1', status='graduated')
+        course = Course.objects.create(code='CS101', title='Intro', department='CS', credits=4)
+        Grade.objects.create(
+            enrollment=Enrollment.objects.create(student=self.student, course=course, term='2020-FALL'),
+            letter='A',
+        )
+        archive_batch([self.student.pk])
+
+    def test_round_trip(self):
+        self.assertFalse(Student.objects.exists())
+        self.assertEqual(restore_students(['S1']), (1, []))
+        student = Student.objects.get(student_id='S1')
+        self.assertEqual((student.pk, student.gpa), (self.student.pk, Decimal('4.00')))
+        self.assertEqual(recompute_gpa(fix=False), [])
+        self.assertFalse(ArchivedStudent.objects.exists())
+
+    def test_collisions_are_reported_not_raised(self):
+        make_student('S1', username='s1-new')  # Reuses the archived student ID and email
+        restored, errors = restore_students(['S1'])
+        self.assertEqual(restored, 0)
+        self.assertEqual(errors, ['S1: student ID is now used by another student'])
+        self.assertTrue(ArchivedStudent.objects.filter(student_id='S1').exists())
+
+    def test_user_with_new_profile_is_reported(self):
+        archived = ArchivedStudent.objects.get()
+        Student.objects.create(
+            user_id=archived.user_id, student_id='S2', first_name='New', last_name='Profile',
+            email='new@example.com', department='CS', year_of_admission=2024,
+            date_of_birth=date(2004, 1, 1),
+        )
+        restored, errors = restore_students(['S1'])
+        self.assertEqual(restored, 0)
+        self.assertEqual(errors, ['S1: user account already has a new student profile'])
+
+
+class ParseRangeTests(TestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(parse_range('bytes=900-', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=990-2000', 1000), (990, 999))
+
+    def test_suffix_ranges(self):
+        self.assertEqual(parse_range('bytes=-100', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=-5000', 1000), (0, 999))
+        self.assertIs(parse_range('bytes=-0', 1000), False)
+
+    def test_unsatisfiable_ranges(self):
+        self.assertIs(parse_range('bytes=1000-', 1000), False)
+        self.assertIs(parse_range('bytes=500-100', 1000), False)
+
+    def test_multi_range_and_malformed_serve_whole_file(self):
+        self.assertIsNone(parse_range('bytes=0-9,20-29', 1000))
+        self.assertIsNone(parse_range('items=0-9', 1000))
+        self.assertIsNone(parse_range('bytes=-', 1000))
+
+
+class MediaTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root, MEDIA_SENDFILE_BACKEND=None)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        os.makedirs(os.path.join(self.media_root, 'student_profiles'))
+        for name in ('owner.jpg', 'José.jpg'):
+            with open(os.path.join(self.media_root, 'student_profiles', name), 'wb') as f:
+                f.write(bytes(range(100)))
+        self.owner = make_student('S1', profile_picture='student_profiles/owner.jpg')
+        self.other = make_student('S2')
+        self.admin = User.objects.create_user('admin1', password='x', role='admin')
+        self.url = reverse('protected_media', kwargs={'path': 'student_profiles/owner.jpg'})
+
+    def get(self, user, **headers):
+        self.client.force_login(user)
+        return self.client.get(self.url, headers=headers)
+
+    def test_owner_and_admin_can_read(self):
+        for user in (self.owner.user, self.admin):
+            response = self.get(user)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b''.join(response.streaming_content), bytes(range(100)))
+
+    def test_other_student_gets_404(self):
+        self.assertEqual(self.get(self.other.user).status_code, 404)
+
+    def test_range_request(self):
+        response = self.get(self.admin, Range='bytes=-10')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 90-99/100')
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(90, 100)))
+        self.assertEqual(self.get(self.admin, Range='bytes=100-').status_code, 416)
+
+    def test_if_range(self):
+        etag = self.get(self.admin)['ETag']
+        response = self.get(self.admin, Range='bytes=0-9', If_Range=etag)
+        self.assertEqual(response.status_code, 206)
+        response = self.get(self.admin, Range='bytes=0-9', If_Range='"stale"')
+        self.assertEqual(response.status_code, 200)
+        response = self.get(self.admin, Range='bytes=0-9', If_Range=http_date(0))
+        self.assertEqual(response.status_code, 200)
+
+    def test_sendfile_headers_are_percent_encoded(self):
+        request = RequestFactory().get('/')
+        with override_settings(MEDIA_SENDFILE_BACKEND='nginx', MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/'):
+            response = serve_media(request, 'student_profiles/José.jpg')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/student_profiles/Jos%C3%A9.jpg')
+        with override_settings(MEDIA_SENDFILE_BACKEND='apache'):
+            response = serve_media(request, 'student_profiles/José.jpg')
+        self.assertTrue(response['X-Sendfile'].endswith('/student_profiles/Jos%C3%A9.jpg'))
+
+
+@override_settings(COUNT_EXACT_CAP=5)
+class CountServicePaginatorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for number in range(12):
+            make_student(f'S{number:02}')
+        self.students = Student.objects.filter(department='CS').order_by('student_id')
+
+    def test_capped_count_does_not_clamp_pages(self):
+        paginator = CountServicePaginator(self.students, 2)
+        self.assertFalse(paginator.count.exact)
+        self.assertEqual(paginator.num_pages, 3)  # From the capped count of 5
+
+        page = paginator.get_page(5)
+        self.assertEqual([s.student_id for s in page], ['S08', 'S09'])
+        self.assertEqual((page.start_index(), page.end_index()), (9, 10))
+        self.assertTrue(page.has_next())
+        last = paginator.get_page(page.next_page_number())
+        self.assertEqual([s.student_id for s in last], ['S10', 'S11'])
+        self.assertFalse(last.has_next())
+
+    def test_page_past_the_end_falls_back_to_first(self):
+        page = CountServicePaginator(self.students, 2).get_page(50)
+        self.assertEqual(page.number, 1)
+
+    def test_exact_count_uses_normal_paging(self):
+        with self.settings(COUNT_EXACT_CAP=100):
+            paginator = CountServicePaginator(self.students, 5)
+            self.assertTrue(paginator.count.exact)
+            self.assertEqual(paginator.get_page(50).number, 3)
+
+
+class StudentFormTests(TestCase):
+    def setUp(self):
+        self.student = make_student('S1')
+        make_student('S2')
+
+    def form(self, **changes):
+        data = {
+            'student_id': 'S1', 'first_name': 'Test', 'last_name': 'S1', 'email': 's1@example.com',
+            'department': 'CS', 'year_of_admission': 2022, 'current_semester': 1,
+            'date_of_birth': '2004-01-01', 'status': 'active', **changes,
+        }
+        return StudentForm(data, instance=Student.objects.get(pk=self.student.pk))
+
+    def test_own_values_are_not_taken(self):
+        form = self.form()
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_values_of_another_student_are_taken(self):
+        form = self.form(student_id='S2', email='s2@example.com')
+        self.assertFalse(form.is_valid())
+        self.assertEqual(set(form.errors), {'student_id', 'email'})
+
+    @override_settings(SYNC_STUDENT_USER_FIELDS=True)
+    def test_synced_fields_are_copied_to_the_user(self):
+        self.form(department='Physics', year_of_admission=2023).save()
+        user = User.objects.get(pk=self.student.user_id)
+        self.assertEqual((user.department, user.year_of_admission), ('Physics', 2023))
+
+    @override_settings(SYNC_STUDENT_USER_FIELDS=False)
+    def test_sync_can_be_turned_off(self):
+        self.form(department='Physics').save()
+        self.assertIsNone(User.objects.get(pk=self.student.user_id).department)
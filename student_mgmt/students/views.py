@@ -2,12 +2,14 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.paginator import Paginator
 from django.db.models import Q
-from django.http import JsonResponse
-from .models import Student
+from django.http import JsonResponse, Http404
+from .models import ArchivedStudent, Student
 from .forms import StudentForm, StudentSearchForm
+from .media import serve_media
 from accounts.models import User
+from student_mgmt.counts import count_rows
+from student_mgmt.pagination import CountServicePaginator
 
 def admin_required(view_func):
     """Custom decorator to ensure only admin users can access certain views"""
@@ -18,6 +20,30 @@ def admin_required(view_func):
         return view_func(request, *args, **kwargs)
     return wrapper
 
+ARCHIVED_RESULTS_SHOWN = 20
+
+def _filter_students(students, cleaned_data):
+    """Apply the search form's filters to a Student or ArchivedStudent queryset"""
+    search_query = cleaned_data.get('search')
+    department_filter = cleaned_data.get('department')
+    status_filter = cleaned_data.get('status')
+    
+    if search_query:
+        # Search in multiple fields using Q objects (OR conditions)
+        students = students.filter(
+            Q(first_name__icontains=search_query) |
+            Q(last_name__icontains=search_query) |
+            Q(student_id__icontains=search_query) |
+            Q(email__icontains=search_query)
+        )
+    
+    if department_filter:
+        students = students.filter(department__icontains=department_filter)
+    
+    if status_filter:
+        students = students.filter(status=status_filter)
+    return students
+
 @login_required
 @admin_required
 def student_list_view(request):
@@ -26,39 +52,30 @@ def student_list_view(request):
     Only accessible by admin users
     """
     search_form = StudentSearchForm(request.GET)
+    # Only the hot table; archived students are searched on request
     students = Student.objects.all()
+    archived = None
     
     # Handle search functionality
     if search_form.is_valid():
-        search_query = search_form.cleaned_data.get('search')
-        department_filter = search_form.cleaned_data.get('department')
-        status_filter = search_form.cleaned_data.get('status')
-        
-        if search_query:
-            # Search in multiple fields using Q objects (OR conditions)
-            students = students.filter(
-                Q(first_name__icontains=search_query) |
-                Q(last_name__icontains=search_query) |
-                Q(student_id__icontains=search_query) |
-                Q(email__icontains=search_query)
-            )
-        
-        if department_filter:
-            students = students.filter(department__icontains=department_filter)
-        
-        if status_filter:
-            students = students.filter(status=status_filter)
+        students = _filter_students(students, search_form.cleaned_data)
+        if search_form.cleaned_data.get('include_archived'):
+            archived = _filter_students(ArchivedStudent.objects.all(), search_form.cleaned_data)
     
     # Pagination - show 10 students per page
-    paginator = Paginator(students, 10)
+    # The count is estimated/capped and cached, and shared with the header
+    paginator = CountServicePaginator(students, 10)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
     context = {
         'page_obj': page_obj,
         'search_form': search_form,
-        'total_students': students.count(),
+        'total_students': paginator.count,
     }
+    if archived is not None:
+        context['archived_students'] = archived[:ARCHIVED_RESULTS_SHOWN]
+        context['archived_total'] = count_rows(archived)
     
     return render(request, 'students/student_list.html', context)
 
@@ -92,10 +109,11 @@ def student_detail_view(request, pk):
     Admin: can view any student
     Student: can only view their own profile
     """
-    student = get_object_or_404(Student, pk=pk)
+    # The template shows the linked account, so fetch it in the same query
+    student = get_object_or_404(Student.objects.select_related('user'), pk=pk)
     
     # Permission check
-    if not request.user.is_admin() and student.user != request.user:
+    if not request.user.is_admin() and student.user_id != request.user.pk:
         messages.error(request, 'You can only view your own profile.')
         return redirect('student_dashboard')
     
@@ -114,7 +132,7 @@ def student_update_view(request, pk):
     student = get_object_or_404(Student, pk=pk)
     
     # Permission check
-    if not request.user.is_admin() and student.user != request.user:
+    if not request.user.is_admin() and student.user_id != request.user.pk:
         messages.error(request, 'You can only edit your own profile.')
         return redirect('student_dashboard')
     
@@ -186,13 +204,16 @@ def create_my_profile_view(request):
     except Student.DoesNotExist:
         pass  # Profile doesn't exist, continue with creation
     
+    if ArchivedStudent.objects.filter(user=request.user).exists():
+        messages.info(request, 'Your student record has been archived. Please contact the administration office.')
+        return redirect('student_dashboard')
+    
     if request.method == 'POST':
         form = StudentForm(request.POST, request.FILES)
         if form.is_valid():
             try:
-                student = form.save(commit=False)
-                student.user = request.user  # Link to current user
-                student.save()
+                form.instance.user = request.user  # Link to current user
+                student = form.save()
                 messages.success(request, 'Your profile has been created successfully!')
                 return redirect('student_detail', pk=student.pk)
             except Exception as e:
@@ -211,4 +232,22 @@ def create_my_profile_view(request):
         'title': 'Create Your Profile',
         'button_text': 'Create Profile'
     }
-    return render(request, 'students/student_form.html', context)
\ No newline at end of file
+    return render(request, 'students/student_form.html', context)
+
+@login_required
+def protected_media_view(request, path):
+    """
+    Serve an uploaded file (profile pictures) to authorized users only
+    Admin: can view any file
+    Student: can only view pictures attached to their own User/Student record
+    """
+    if not request.user.is_admin():
+        owns_file = (
+            Student.objects.filter(user=request.user, profile_picture=path).exists()
+            or User.objects.filter(pk=request.user.pk, profile_pic=path).exists()
+        )
+        if not owns_file:
+            # 404 rather than 403 so file names cannot be probed
+            raise Http404('Media file not found')
+
+    return serve_media(request, path)
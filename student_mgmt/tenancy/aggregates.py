@@ -0,0 +1,30 @@
+# tenancy/aggregates.py
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+
+from .tenants import get_tenant_database, get_tenants, use_tenant
+
+
+def _run_for_tenant(name, func):
+    with use_tenant(name):
+        try:
+            return func()
+        finally:
+            # Worker threads get their own connections; don't leak them
+            connections[get_tenant_database(name)].close()
+
+
+def fan_out(func, tenants=None, max_workers=None):
+    """
+    Call `func()` once per tenant, in parallel, with that tenant active
+    Returns {tenant_name: result}. Each call runs in its own thread and
+    database connection, so total latency is roughly the slowest campus
+    rather than the sum of all of them.
+    """
+    names = list(tenants if tenants is not None else get_tenants())
+    if not names:
+        return {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(names)) as pool:
+        futures = {name: pool.submit(_run_for_tenant, name, func) for name in names}
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,31 @@
+# tenancy/management/commands/migrate_tenants.py
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from tenancy.tenants import get_tenant_database, get_tenants
+
+
+class Command(BaseCommand):
+    help = "Apply migrations to every campus database (or the ones given)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('tenants', nargs='*', help='Tenant names (default: all)')
+        parser.add_argument('--skip-default', action='store_true',
+                            help="Don't migrate the 'default' database")
+
+    def handle(self, *args, **options):
+        names = options['tenants'] or list(get_tenants())
+        unknown = set(names) - set(get_tenants())
+        if unknown:
+            raise CommandError(f"Unknown tenant(s): {', '.join(sorted(unknown))}")
+
+        aliases = [] if options['skip_default'] else ['default']
+        for name in names:
+            alias = get_tenant_database(name)
+            if alias not in aliases:
+                aliases.append(alias)
+
+        for alias in aliases:
+            self.stdout.write(self.style.MIGRATE_HEADING(f'Migrating database {alias!r}'))
+            call_command('migrate', database=alias, interactive=False,
+                         verbosity=options['verbosity'], stdout=self.stdout)
@@ -0,0 +1,60 @@
+# tenancy/middleware.py
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import Http404
+from django.urls import set_script_prefix
+
+from .tenants import activate_tenant, deactivate_tenant, tenant_for_host, tenant_for_prefix
+
+
+class TenantMiddleware:
+    """
+    Resolve the campus for each request and pin its queries to that database
+
+    Hostname is tried first, then the first URL segment. A matched prefix is
+    moved from path_info to SCRIPT_NAME so URL resolution and reverse() work
+    unchanged under /<prefix>/. Must come before SessionMiddleware so sessions
+    and users load from the tenant's database.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = activate_tenant(self.resolve(request))
+        try:
+            return self.get_response(request)
+        finally:
+            deactivate_tenant(token)
+
+    async def __acall__(self, request):
+        token = activate_tenant(self.resolve(request))
+        try:
+            return await self.get_response(request)
+        finally:
+            deactivate_tenant(token)
+
+    def resolve(self, request):
+        name = tenant_for_host(request.get_host())
+        if name is None:
+            name = self.resolve_prefix(request)
+        if name is None and getattr(settings, 'TENANT_REQUIRED', False):
+            raise Http404('Unknown campus')
+        request.tenant = name
+        return name
+
+    def resolve_prefix(self, request):
+        segment, _, rest = request.path_info.lstrip('/').partition('/')
+        name = tenant_for_prefix(segment) if segment else None
+        if name is not None:
+            script_name = request.META.get('SCRIPT_NAME', '').rstrip('/') + '/' + segment
+            request.META['SCRIPT_NAME'] = script_name
+            request.path_info = '/' + rest
+            set_script_prefix(script_name + '/')
+        return name
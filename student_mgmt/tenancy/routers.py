@@ -0,0 +1,28 @@
+# tenancy/routers.py
+from .tenants import get_current_tenant, get_tenant_database
+
+
+class TenantRouter:
+    """
+    Send every read and write to the active tenant's database alias
+    With no active tenant Django's normal routing ('default') applies.
+    All tenant databases share one schema, so migrations run everywhere.
+    """
+
+    def _tenant_db(self, hints):
+        # Objects stay in the database they were loaded from
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        name = get_current_tenant()
+        return get_tenant_database(name) if name else None
+
+    def db_for_read(self, model, **hints):
+        return self._tenant_db(hints)
+
+    def db_for_write(self, model, **hints):
+        return self._tenant_db(hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Rows from different campuses must never be linked
+        return obj1._state.db == obj2._state.db
@@ -0,0 +1,81 @@
+# tenancy/tenants.py
+"""
+Campus (tenant) configuration and the current-tenant context
+
+settings.TENANTS maps a tenant name to its config:
+
+    TENANTS = {
+        'north': {
+            'hosts': ['north.campus.edu'],   # Resolve by hostname
+            'prefix': 'north',               # ...or by /north/... URL prefix
+            'database': 'north',             # Alias in settings.DATABASES
+        },
+    }
+
+'prefix' and 'database' default to the tenant name. The current tenant is
+kept in a ContextVar so it follows the request through threads-per-request
+(WSGI) and tasks (ASGI) alike.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_current_tenant = ContextVar('current_tenant', default=None)
+
+
+class UnknownTenant(LookupError):
+    pass
+
+
+def get_tenants():
+    return getattr(settings, 'TENANTS', {})
+
+
+def get_tenant_database(name):
+    try:
+        config = get_tenants()[name]
+    except KeyError:
+        raise UnknownTenant(f'No tenant configured as {name!r}')
+    return config.get('database', name)
+
+
+def get_current_tenant():
+    """Name of the active tenant, or None when running against 'default'"""
+    return _current_tenant.get()
+
+
+def activate_tenant(name):
+    """Make `name` the active tenant; returns a token for deactivate_tenant()"""
+    if name is not None:
+        get_tenant_database(name)  # Validate
+    return _current_tenant.set(name)
+
+
+def deactivate_tenant(token):
+    _current_tenant.reset(token)
+
+
+@contextmanager
+def use_tenant(name):
+    """Run a block against one tenant's database"""
+    token = activate_tenant(name)
+    try:
+        yield
+    finally:
+        deactivate_tenant(token)
+
+
+def tenant_for_host(host):
+    host = host.split(':')[0].lower()
+    for name, config in get_tenants().items():
+        if host in (h.lower() for h in config.get('hosts', [])):
+            return name
+    return None
+
+
+def tenant_for_prefix(prefix):
+    for name, config in get_tenants().items():
+        if config.get('prefix', name) == prefix:
+            return name
+    return None
@@ -0,0 +1,86 @@
+from django.db import router
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse, set_script_prefix
+
+from accounts.models import User
+from .aggregates import fan_out
+from .middleware import TenantMiddleware
+from .tenants import get_current_tenant, use_tenant
+
+TENANTS = {
+    'main': {'database': 'default'},
+    'north': {'hosts': ['north.campus.edu'], 'database': 'campus_test'},
+}
+
+
+@override_settings(TENANTS=TENANTS)
+class TenantMiddlewareTests(TestCase):
+    databases = {'default', 'campus_test'}
+
+    def setUp(self):
+        self.addCleanup(set_script_prefix, '/')
+
+    def run_middleware(self, path, **extra):
+        seen = {}
+
+        def get_response(request):
+            seen.update(tenant=get_current_tenant(), login=reverse('login'))
+            return None
+
+        request = RequestFactory().get(path, **extra)
+        TenantMiddleware(get_response)(request)
+        return request, seen
+
+    def test_prefix_moves_to_script_name(self):
+        request, seen = self.run_middleware('/north/students/1/')
+        self.assertEqual((request.path_info, request.META['SCRIPT_NAME']), ('/students/1/', '/north'))
+        self.assertEqual(seen, {'tenant': 'north', 'login': '/north/login/'})
+        self.assertIsNone(get_current_tenant())
+
+    def test_host_wins_and_keeps_the_path(self):
+        request, seen = self.run_middleware('/login/', HTTP_HOST='north.campus.edu')
+        self.assertEqual((request.path_info, request.tenant, seen['tenant']), ('/login/', 'north', 'north'))
+
+    def test_unknown_prefix_is_left_alone(self):
+        request, seen = self.run_middleware('/south/login/')
+        self.assertEqual((request.path_info, seen['tenant']), ('/south/login/', None))
+
+    def test_links_in_pages_keep_the_prefix(self):
+        response = self.client.get('/north/login/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'href="/north/register/"')
+
+
+@override_settings(TENANTS=TENANTS)
+class TenantRouterTests(TestCase):
+    databases = {'default', 'campus_test'}
+
+    def test_queries_go_to_the_active_tenant(self):
+        self.assertEqual(router.db_for_read(User), 'default')
+        with use_tenant('north'):
+            self.assertEqual(router.db_for_write(User), 'campus_test')
+            User.objects.create_user('northerner')
+            self.assertTrue(User.objects.filter(username='northerner').exists())
+        self.assertFalse(User.objects.filter(username='northerner').exists())
+        self.assertTrue(User.objects.using('campus_test').filter(username='northerner').exists())
+
+    def test_loaded_objects_stay_in_their_database(self):
+        north = User.objects.db_manager('campus_test').create_user('northerner')
+        main = User.objects.create_user('local')
+        self.assertEqual(router.db_for_write(User, instance=north), 'campus_test')
+        with use_tenant('main'):
+            self.assertEqual(router.db_for_write(User, instance=north), 'campus_test')
+        self.assertFalse(router.allow_relation(north, main))
+
+
+@override_settings(TENANTS=TENANTS)
+class FanOutTests(TransactionTestCase):
+    databases = {'default', 'campus_test'}
+
+    def test_runs_once_per_tenant(self):
+        User.objects.create_user('local')
+        User.objects.db_manager('campus_test').create_user('northerner')
+        result = fan_out(lambda: (get_current_tenant(), list(User.objects.values_list('username', flat=True))))
+        self.assertEqual(result, {'main': ('main', ['local']), 'north': ('north', ['northerner'])})
+        self.assertEqual(fan_out(User.objects.count, tenants=['north']), {'north': 1})
+        self.assertEqual(fan_out(User.objects.count, tenants=[]), {})